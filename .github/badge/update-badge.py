@@ -1,25 +1,25 @@
 #!/usr/bin/env python3
 import os
-import pandas as pd
+import json
+import sys
 
 # List of sports for which badges will be generated
 target_sports = ["baseball", "football", "basketball", "hockey"]
 
-# Load the dataset from the Parquet file
-parquet_path = os.path.join("output", "dataset.parquet")
-df = pd.read_parquet(parquet_path)
+# Load the statistics written by scripts/build-parquet.py next to the dataset
+stats_path = os.path.join("output", "stats.json")
+try:
+    with open(stats_path, "r", encoding="utf-8") as f:
+        categories = {name.lower(): stats for name, stats in json.load(f)["categories"].items()}
+except (OSError, ValueError, KeyError) as e:
+    print(f"Error loading {stats_path} (run scripts/build-parquet.py first): {e}")
+    sys.exit(1)
 
-# Initialize counts dictionary
+# Compute counts: cards and their variations, leaving out parallels
 counts = {}
-
-# Compute counts: only count records where 'parallel' is empty or null
 for sport in target_sports:
-    # Ensure case-insensitive matching for the category
-    sport_mask = df["category"].str.lower() == sport.lower()
-    # Condition for no parallel: either null or empty string
-    no_parallel_mask = df["parallel"].isnull() | (df["parallel"] == "")
-    count = df[sport_mask & no_parallel_mask].shape[0]
-    counts[sport] = count
+    stats = categories.get(sport, {})
+    counts[sport] = stats.get("cards", 0) + stats.get("variations", 0)
 
 # Debug: Output the counts to the console
 print("Card counts by sport:")
@@ -51,11 +51,19 @@ def generate_badge_svg(sport, count):
 </svg>'''
     return svg_template
 
-# Generate an SVG badge for each sport and write it to a file
+# Generate an SVG badge for each sport and write it to a file, unless it is unchanged
 for sport in target_sports:
     count = counts.get(sport, 0)
     svg_content = generate_badge_svg(sport, count)
     badge_path = os.path.join(".github", "badge", f"{sport}.svg")
+    try:
+        with open(badge_path, "r", encoding="utf-8") as svg_file:
+            unchanged = svg_file.read() == svg_content
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print(f"Badge for {sport} unchanged with count: {count}")
+        continue
     with open(badge_path, "w", encoding="utf-8") as svg_file:
         svg_file.write(svg_content)
     print(f"Badge for {sport} updated with count: {count}")
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 import os
 import json
-import matplotlib.pyplot as plt
+import hashlib
+import struct
+import sys
 
 # Read dimensions from environment variables (in pixels), with defaults if not provided.
 GRAPH_WIDTH = int(os.environ.get("GRAPH_WIDTH", "800"))
@@ -13,41 +15,62 @@ height_in = GRAPH_HEIGHT / dpi
 # List of sports for which graphs will be generated
 target_sports = ["baseball", "football", "basketball", "hockey"]
 
+# PNG text chunk holding a digest of the inputs a graph was drawn from
+INPUTS_KEY = "CardListsInputs"
+
+def png_text(path):
+    """Return the tEXt chunks of a PNG file as a dict, or an empty dict if it cannot be read."""
+    text = {}
+    try:
+        with open(path, "rb") as f:
+            if f.read(8) != b"\x89PNG\r\n\x1a\n":
+                return text
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                length, chunk_type = struct.unpack(">I4s", header)
+                if chunk_type == b"IDAT" or chunk_type == b"IEND":
+                    break
+                data = f.read(length)
+                f.read(4)  # CRC
+                if chunk_type == b"tEXt":
+                    key, _, value = data.partition(b"\0")
+                    text[key.decode("latin-1")] = value.decode("latin-1")
+    except OSError:
+        pass
+    return text
+
 # Ensure the output directory for badges exists
 graph_dir = os.path.join(".github", "graph")
 os.makedirs(graph_dir, exist_ok=True)
 
-# Process each sport's category JSON file to generate a bar graph
+# Load the statistics written by scripts/build-parquet.py next to the dataset
+stats_path = os.path.join("output", "stats.json")
+try:
+    with open(stats_path, "r", encoding="utf-8") as f:
+        categories = {name.lower(): stats for name, stats in json.load(f)["categories"].items()}
+except (OSError, ValueError, KeyError) as e:
+    print(f"Error loading {stats_path} (run scripts/build-parquet.py first): {e}")
+    sys.exit(1)
+
+plt = None
+
+# Generate a bar graph from each sport's indexed-release percentages
 for sport in target_sports:
-    category_file = os.path.join("categories", f"{sport}.json")
-    try:
-        with open(category_file, "r", encoding="utf-8") as f:
-            category_data = json.load(f)
-    except Exception as e:
-        print(f"Error loading category file for {sport}: {e}")
+    if sport not in categories:
+        print(f"No statistics found for {sport}. Skipping graph generation.")
         continue
 
-    # Extract the years array from the JSON structure.
-    years_data = category_data.get("category", {}).get("years", [])
-    
-    # Calculate the percentage of indexed releases per year.
+    # Percentage of indexed releases per year, as computed from categories/<sport>.json.
     indexed_percentages = {}
-    for entry in years_data:
+    for year_key, indexed in categories[sport].get("indexed", {}).items():
         try:
             # Extract the first 4 characters to get the year (e.g., "2001" from "2001-02")
-            year_str = entry.get("year", "")[:4]
-            year = int(year_str)
+            year = int(year_key[:4])
         except ValueError:
             continue
-        
-        releases = entry.get("releases", [])
-        total = len(releases)
-        if total == 0:
-            percent = 0.0
-        else:
-            indexed_count = sum(1 for r in releases if r.get("indexed", False))
-            percent = (indexed_count / total) * 100
-        indexed_percentages[year] = percent
+        indexed_percentages[year] = indexed["percent"]
 
     # Determine the bounds based only on years where at least one release is indexed.
     valid_years = [year for year, percent in indexed_percentages.items() if percent > 0]
@@ -62,6 +85,17 @@ for sport in target_sports:
     all_years = list(range(min_year, max_year + 1))
     percentages = [indexed_percentages.get(year, 0.0) for year in all_years]
 
+    # Skip re-rendering when the graph was already drawn from the same inputs.
+    bar_graph_path = os.path.join(graph_dir, f"{sport}_bar.png")
+    inputs = json.dumps([sport, GRAPH_WIDTH, GRAPH_HEIGHT, all_years, percentages])
+    digest = hashlib.sha256(inputs.encode("utf-8")).hexdigest()
+    if png_text(bar_graph_path).get(INPUTS_KEY) == digest:
+        print(f"Bar graph for {sport} unchanged at {bar_graph_path}")
+        continue
+
+    if plt is None:
+        import matplotlib.pyplot as plt
+
     # Create the bar graph using the dimensions from the environment variables.
     fig, ax = plt.subplots(figsize=(width_in, height_in), dpi=dpi)
     ax.bar(all_years, percentages, width=0.8, align='center', color='green')
@@ -79,7 +113,6 @@ for sport in target_sports:
     # Alternatively, you could use: ax.margins(x=0)
 
     plt.tight_layout()
-    bar_graph_path = os.path.join(graph_dir, f"{sport}_bar.png")
-    plt.savefig(bar_graph_path)
+    plt.savefig(bar_graph_path, metadata={INPUTS_KEY: digest})
     plt.close(fig)
     print(f"Bar graph for {sport} generated at {bar_graph_path}")
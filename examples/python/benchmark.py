@@ -0,0 +1,121 @@
+"""
+Compare the cardlists loader with the pydantic models the Python example used to build, on the
+largest releases in categories/. For each release it reports the best of --repeat load times
+(json.load included) and the peak memory traced while loading.
+
+    python benchmark.py [--count 3] [--repeat 5]
+
+pydantic is optional; without it only the cardlists rows are printed.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional
+from cardlists import load_release
+
+try:
+    from pydantic import BaseModel
+except ImportError:
+    BaseModel = None
+
+CATEGORIES_DIR = Path(__file__).resolve().parents[2] / "categories"
+
+if BaseModel is not None:
+    # The models examples/python/main.py used before the cardlists package.
+    class AttributeItem(BaseModel):
+        attribute: str
+        note: str
+
+    class InsertOdd(BaseModel):
+        product: str
+        odds: str
+
+    class Parallel(BaseModel):
+        name: str
+        numberedTo: Optional[int] = None
+        notes: Optional[List[str]] = None
+        insertOdds: Optional[List[InsertOdd]] = None
+
+    class Variation(BaseModel):
+        variation: str
+        note: Optional[str] = None
+        insertOdds: Optional[List[InsertOdd]] = None
+        parallels: Optional[List[Parallel]] = None
+        attributes: Optional[List[str]] = None
+        numberedTo: Optional[int] = None
+
+    class Card(BaseModel):
+        uniqueId: str
+        number: Optional[str] = None
+        name: str
+        attributes: Optional[List[str]] = None
+        insertOdds: Optional[List[InsertOdd]] = None
+        note: Optional[str] = None
+        variations: Optional[List[Variation]] = None
+        parallels: Optional[List[Parallel]] = None
+        numberedTo: Optional[int] = None
+
+    class Set(BaseModel):
+        uniqueId: str
+        name: str
+        notes: Optional[List[str]] = None
+        numberedTo: Optional[int] = None
+        insertOdds: Optional[List[InsertOdd]] = None
+        variations: Optional[List[Variation]] = None
+        parallels: Optional[List[Parallel]] = None
+        attributes: Optional[List[str]] = None
+        cards: List[Card]
+
+    class CardList(BaseModel):
+        name: str
+        version: str
+        uniqueId: str
+        notes: Optional[List[str]] = None
+        attributes: Optional[List[AttributeItem]] = None
+        sets: List[Set]
+
+def load_pydantic(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return CardList(**json.load(f))
+
+def measure(load, path, repeat):
+    """Return (best seconds, peak traced bytes) for load(path)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = load(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cardlists loader against pydantic models.")
+    parser.add_argument("--count", type=int, default=3, help="Number of largest releases to load (default: 3)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed loads per release and loader (default: 5)")
+    args = parser.parse_args()
+
+    paths = sorted(CATEGORIES_DIR.glob("*/*/*.json"), key=lambda path: path.stat().st_size, reverse=True)
+    loaders = [
+        ("cardlists", lambda path: load_release(path)),
+        ("cardlists (validate)", lambda path: load_release(path, validate=True)),
+    ]
+    if BaseModel is not None:
+        loaders.append(("pydantic", load_pydantic))
+    else:
+        print("pydantic is not installed; skipping the pydantic comparison.\n")
+
+    print(f"{'Release':<32} {'Loader':<22} {'Time':>10} {'Peak memory':>12}")
+    for path in paths[:args.count]:
+        size = path.stat().st_size / 1024 / 1024
+        for name, load in loaders:
+            seconds, peak = measure(load, path, args.repeat)
+            print(f"{path.stem + f' ({size:.1f} MB)':<32} {name:<22} {seconds * 1000:>7.1f} ms {peak / 1024 / 1024:>9.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Fast typed loader for CardLists Release JSON files.
+
+    from cardlists import load_release
+
+    release = load_release("categories/baseball/2025/2025-Topps.json", validate=True)
+    for card_set, card in release.iter_cards():
+        print(card_set.name, card.number, card.name)
+"""
+from .loader import ValidationError, load_release, parse_release, validate_release
+from .models import AttributeItem, Card, CardSet, InsertOdd, Parallel, Release, Variation
+
+__all__ = [
+    "AttributeItem", "Card", "CardSet", "InsertOdd", "Parallel", "Release", "ValidationError",
+    "Variation", "load_release", "parse_release", "validate_release",
+]
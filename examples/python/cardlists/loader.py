@@ -0,0 +1,108 @@
+"""
+Loading and optional validation of Release JSON files.
+
+Validation checks what the typed objects rely on: required fields are present and every
+field has the JSON type of schemas/release.json (strings, integers, lists of either, or
+nested objects). It is a single walk over the decoded dicts, done before the objects are
+built, and can be skipped for trusted files.
+
+Files are decoded with orjson when it is installed, and with the standard json module otherwise.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .models import Release
+
+STRINGS = ("list", str)
+INTEGER = int
+
+# Field specs per object type: field -> (spec, required). A spec is a Python type, the name
+# of another object type, or ("list", spec).
+OBJECT_FIELDS = {
+    "release": {
+        "name": (str, True), "version": (str, True), "uniqueId": (str, True), "notes": (STRINGS, False),
+        "attributes": (("list", "attribute"), False), "sets": (("list", "set"), True),
+    },
+    "attribute": {"attribute": (str, True), "note": (str, True)},
+    "insertOdds": {"product": (str, True), "odds": (str, True)},
+    "parallel": {
+        "name": (str, True), "numberedTo": (INTEGER, False), "notes": (STRINGS, False),
+        "insertOdds": (("list", "insertOdds"), False),
+    },
+    "variation": {
+        "variation": (str, True), "note": (str, False), "insertOdds": (("list", "insertOdds"), False),
+        "parallels": (("list", "parallel"), False), "attributes": (STRINGS, False),
+        "numberedTo": (INTEGER, False),
+    },
+    "card": {
+        "uniqueId": (str, True), "number": (str, False), "name": (str, True), "attributes": (STRINGS, False),
+        "insertOdds": (("list", "insertOdds"), False), "note": (str, False),
+        "variations": (("list", "variation"), False), "parallels": (("list", "parallel"), False),
+        "numberedTo": (INTEGER, False),
+    },
+    "set": {
+        "uniqueId": (str, True), "name": (str, True), "notes": (STRINGS, False), "numberedTo": (INTEGER, False),
+        "insertOdds": (("list", "insertOdds"), False), "variations": (("list", "variation"), False),
+        "parallels": (("list", "parallel"), False), "attributes": (STRINGS, False),
+        "cards": (("list", "card"), True),
+    },
+}
+
+
+class ValidationError(ValueError):
+    """Raised when a Release document does not have the expected shape; lists every problem."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} validation error(s):\n" + "\n".join(errors))
+        self.errors = errors
+
+
+def _check(value, spec, path, errors):
+    if isinstance(spec, tuple):
+        if not isinstance(value, list):
+            errors.append(f"{path}: expected a list")
+            return
+        for index, item in enumerate(value):
+            _check(item, spec[1], f"{path}[{index}]", errors)
+    elif isinstance(spec, str):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected an object")
+            return
+        for field, (field_spec, required) in OBJECT_FIELDS[spec].items():
+            if field in value:
+                _check(value[field], field_spec, f"{path}.{field}", errors)
+            elif required:
+                errors.append(f"{path}.{field}: field required")
+    elif spec is int:
+        # bool is an int subclass in Python but not an integer in JSON.
+        if not isinstance(value, int) or isinstance(value, bool):
+            errors.append(f"{path}: expected an integer")
+    elif not isinstance(value, spec):
+        errors.append(f"{path}: expected a string")
+
+
+def validate_release(data):
+    """Raise ValidationError if data (a decoded Release JSON document) is malformed."""
+    errors = []
+    _check(data, "release", "release", errors)
+    if errors:
+        raise ValidationError(errors)
+
+
+def parse_release(data, validate=False):
+    """Build a Release from a decoded JSON document, validating it first if asked to."""
+    if validate:
+        validate_release(data)
+    return Release.from_dict(data)
+
+
+def load_release(path, validate=False):
+    """Read a Release JSON file into a Release object."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return parse_release(data, validate)
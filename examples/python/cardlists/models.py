@@ -0,0 +1,165 @@
+"""
+Compact, typed objects for the Release JSON documents (see schemas/release.json).
+
+Every class uses __slots__, so an object costs little more than a tuple, and is built by its
+from_dict() classmethod straight from the dicts returned by json.load. Optional values that
+are absent from the JSON are None.
+"""
+
+
+def _objects(cls, values):
+    return None if values is None else [cls.from_dict(value) for value in values]
+
+
+class _Model:
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the object as JSON-ready dicts and lists, leaving out values that are None."""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, _Model) else item for item in value]
+            result[name] = value
+        return result
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[:3])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+class AttributeItem(_Model):
+    __slots__ = ("attribute", "note")
+
+    def __init__(self, attribute, note):
+        self.attribute = attribute
+        self.note = note
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["attribute"], data["note"])
+
+
+class InsertOdd(_Model):
+    __slots__ = ("product", "odds")
+
+    def __init__(self, product, odds):
+        self.product = product
+        self.odds = odds
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["product"], data["odds"])
+
+
+class Parallel(_Model):
+    __slots__ = ("name", "numberedTo", "notes", "insertOdds")
+
+    def __init__(self, name, numberedTo=None, notes=None, insertOdds=None):
+        self.name = name
+        self.numberedTo = numberedTo
+        self.notes = notes
+        self.insertOdds = insertOdds
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(data["name"], get("numberedTo"), get("notes"), _objects(InsertOdd, get("insertOdds")))
+
+
+class Variation(_Model):
+    __slots__ = ("variation", "note", "insertOdds", "parallels", "attributes", "numberedTo")
+
+    def __init__(self, variation, note=None, insertOdds=None, parallels=None, attributes=None, numberedTo=None):
+        self.variation = variation
+        self.note = note
+        self.insertOdds = insertOdds
+        self.parallels = parallels
+        self.attributes = attributes
+        self.numberedTo = numberedTo
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(data["variation"], get("note"), _objects(InsertOdd, get("insertOdds")),
+                   _objects(Parallel, get("parallels")), get("attributes"), get("numberedTo"))
+
+
+class Card(_Model):
+    __slots__ = ("uniqueId", "number", "name", "attributes", "insertOdds", "note", "variations",
+                 "parallels", "numberedTo")
+
+    def __init__(self, uniqueId, name, number=None, attributes=None, insertOdds=None, note=None,
+                 variations=None, parallels=None, numberedTo=None):
+        self.uniqueId = uniqueId
+        self.number = number
+        self.name = name
+        self.attributes = attributes
+        self.insertOdds = insertOdds
+        self.note = note
+        self.variations = variations
+        self.parallels = parallels
+        self.numberedTo = numberedTo
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(data["uniqueId"], data["name"], get("number"), get("attributes"),
+                   _objects(InsertOdd, get("insertOdds")), get("note"), _objects(Variation, get("variations")),
+                   _objects(Parallel, get("parallels")), get("numberedTo"))
+
+
+class CardSet(_Model):
+    __slots__ = ("uniqueId", "name", "notes", "numberedTo", "insertOdds", "variations", "parallels",
+                 "attributes", "cards")
+
+    def __init__(self, uniqueId, name, cards, notes=None, numberedTo=None, insertOdds=None,
+                 variations=None, parallels=None, attributes=None):
+        self.uniqueId = uniqueId
+        self.name = name
+        self.notes = notes
+        self.numberedTo = numberedTo
+        self.insertOdds = insertOdds
+        self.variations = variations
+        self.parallels = parallels
+        self.attributes = attributes
+        self.cards = cards
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(data["uniqueId"], data["name"], _objects(Card, data["cards"]), get("notes"),
+                   get("numberedTo"), _objects(InsertOdd, get("insertOdds")),
+                   _objects(Variation, get("variations")), _objects(Parallel, get("parallels")),
+                   get("attributes"))
+
+
+class Release(_Model):
+    __slots__ = ("name", "version", "uniqueId", "notes", "attributes", "sets")
+
+    def __init__(self, name, version, uniqueId, sets, notes=None, attributes=None):
+        self.name = name
+        self.version = version
+        self.uniqueId = uniqueId
+        self.notes = notes
+        self.attributes = attributes
+        self.sets = sets
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(data["name"], data["version"], data["uniqueId"], _objects(CardSet, data["sets"]),
+                   get("notes"), _objects(AttributeItem, get("attributes")))
+
+    def iter_cards(self):
+        """Yield (set, card) for every card of the release, in document order."""
+        for card_set in self.sets:
+            for card in card_set.cards:
+                yield card_set, card
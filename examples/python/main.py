@@ -1,75 +1,14 @@
 import json
-from pathlib import Path
-from typing import List, Optional
-from pydantic import BaseModel, ValidationError
-
-# Model definitions based on the updated JSON schema
-
-class AttributeItem(BaseModel):
-    attribute: str
-    note: str
-
-class InsertOdd(BaseModel):
-    product: str
-    odds: str
-
-class Parallel(BaseModel):
-    name: str
-    numberedTo: Optional[int] = None
-    notes: Optional[List[str]] = None
-    insertOdds: Optional[List[InsertOdd]] = None
-
-class Variation(BaseModel):
-    variation: str
-    note: Optional[str] = None
-    insertOdds: Optional[List[InsertOdd]] = None
-    parallels: Optional[List[Parallel]] = None  # Forward reference handled below
-    attributes: Optional[List[str]] = None
-    numberedTo: Optional[int] = None
-
-class Card(BaseModel):
-    uniqueId: str
-    number: Optional[str] = None
-    name: str
-    attributes: Optional[List[str]] = None
-    insertOdds: Optional[List[InsertOdd]] = None
-    note: Optional[str] = None
-    variations: Optional[List[Variation]] = None
-    parallels: Optional[List[Parallel]] = None
-
-class Set(BaseModel):
-    uniqueId: str
-    name: str
-    notes: Optional[List[str]] = None
-    numberedTo: Optional[int] = None
-    insertOdds: Optional[List[InsertOdd]] = None
-    variations: Optional[List[Variation]] = None
-    parallels: Optional[List[Parallel]] = None
-    cards: List[Card]
-
-class CardList(BaseModel):
-    name: str
-    version: str
-    uniqueId: str
-    notes: Optional[List[str]] = None
-    attributes: Optional[List[AttributeItem]] = None
-    sets: List[Set]
-
-# Resolve forward references in Variation (for the Parallel type)
-Variation.update_forward_refs()
+from cardlists import ValidationError, load_release
 
 def main(file_path: str):
     try:
-        # Load and parse the JSON file
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-
-        # Validate and parse the JSON data into the CardList model
-        root_object = CardList(**data)
+        # Load the JSON file, validate it and build the typed Release objects
+        release = load_release(file_path, validate=True)
 
         # Print the validated data in a pretty format
         print("JSON file loaded and validated successfully!")
-        print(json.dumps(root_object.dict(), indent=4))
+        print(json.dumps(release.to_dict(), indent=4))
 
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
@@ -77,7 +16,7 @@ def main(file_path: str):
         print(f"Error: Failed to decode JSON - {e}")
     except ValidationError as e:
         print("Error: JSON validation failed.")
-        print(e.json())
+        print("\n".join(e.errors))
 
 if __name__ == "__main__":
     import sys
@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 import os
 import sys
-import json
 import uuid
+from json_rewrite import load_json, write_json
 
 def process_file(filepath):
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data, original = load_json(filepath)
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
         return
@@ -47,9 +46,10 @@ def process_file(filepath):
                 release["uniqueId"] = str(uuid.uuid4())
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-        print(f"Updated: {filepath}")
+        if write_json(filepath, data, original):
+            print(f"Updated: {filepath}")
+        else:
+            print(f"No changes needed for {filepath}")
     except Exception as e:
         print(f"Error writing {filepath}: {e}")
 
@@ -1,47 +1,61 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
-import json
 import uuid
+from json_rewrite import load_json, map_files, write_json
 
 #Adds the Unique ID field fo each card and set in the JSON files
 
 def process_file(filepath):
+    """Add missing set and card uniqueIds to one file. Returns (filepath, status message or None)."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data, original = load_json(filepath)
     except Exception as e:
-        print(f"Error reading {filepath}: {e}")
-        return
+        return filepath, f"Error reading {filepath}: {e}"
 
     # Process each set in the release
+    added = 0
     sets = data.get("sets", [])
     for s in sets:
         if "uniqueId" not in s:
             s["uniqueId"] = str(uuid.uuid4())
+            added += 1
         # Process each card in the set
         cards = s.get("cards", [])
         for card in cards:
             if "uniqueId" not in card:
                 card["uniqueId"] = str(uuid.uuid4())
+                added += 1
+
+    # Files that already have every ID are left untouched
+    if not added:
+        return filepath, None
 
     # Write back the modified JSON data
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-        print(f"Updated: {filepath}")
+        write_json(filepath, data, original)
     except Exception as e:
-        print(f"Error writing {filepath}: {e}")
+        return filepath, f"Error writing {filepath}: {e}"
+    return filepath, f"Updated: {filepath}"
 
-def main(root_path):
+def main(root_path, workers=1):
+    files = []
     for dirpath, _, filenames in os.walk(root_path):
         for filename in filenames:
             if filename.lower().endswith('.json'):
-                file_path = os.path.join(dirpath, filename)
-                process_file(file_path)
+                files.append(os.path.join(dirpath, filename))
+    for _, message in map_files(process_file, sorted(files), workers):
+        if message:
+            print(message)
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: python add-uid.py <path>")
+    parser = argparse.ArgumentParser(description="Add a uniqueId to every set and card missing one.")
+    parser.add_argument("path", help="Directory to scan recursively for release JSON files")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of processes used to update files (0 = one per CPU, default: 0)")
+    args = parser.parse_args()
+    if not os.path.isdir(args.path):
+        print(f"Error: {args.path} is not a valid directory")
         sys.exit(1)
-    main(sys.argv[1])
+    main(args.path, args.workers if args.workers > 0 else (os.cpu_count() or 1))
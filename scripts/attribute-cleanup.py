@@ -1,173 +1,230 @@
-import json
+import argparse
 import os
 import glob
 import jsonschema
-import copy
+import functools
 from urllib.parse import urlparse
 from urllib.request import urlopen
 import sys
+import json_codec
+from json_rewrite import load_json, map_files, write_json
 
+# The schemas published by this repository are resolved from the local checkout instead of
+# being fetched, so the script works offline and each schema is read only once.
+SCHEMAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'schemas')
+SCHEMA_URL_PREFIXES = (
+    'https://raw.githubusercontent.com/JunkWaxData/CardLists/refs/heads/main/schemas/',
+    'https://raw.githubusercontent.com/JunkWaxData/CardLists/main/schemas/',
+)
+
+def resolve_local_schema(schema_url):
+    """Map a published schema URL (e.g. .../schemas/release.json) to its file in schemas/, if any."""
+    for prefix in SCHEMA_URL_PREFIXES:
+        if schema_url.startswith(prefix):
+            local_path = os.path.join(SCHEMAS_DIR, schema_url[len(prefix):])
+            if os.path.isfile(local_path):
+                return local_path
+    return None
+
+@functools.lru_cache(maxsize=None)
 def load_schema(schema_url):
-    """Load schema from URL or local file."""
+    """Load schema from the local schema registry, a URL or a local file (cached per process)."""
     try:
+        local_path = resolve_local_schema(schema_url)
+        if local_path:
+            return json_codec.load_path(local_path)
         parsed_url = urlparse(schema_url)
         if parsed_url.scheme in ('http', 'https'):
             with urlopen(schema_url) as response:
-                return json.loads(response.read().decode('utf-8'))
+                return json_codec.loads(response.read())
         else:
             # Assume it's a local file
-            with open(schema_url, 'r') as f:
-                return json.load(f)
+            return json_codec.load_path(schema_url)
     except Exception as e:
         print(f"Error loading schema {schema_url}: {e}")
         return None
 
-def detect_indentation(file_path):
-    """Detect indentation in JSON file."""
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    # Find the first indented line
-    lines = content.split('\n')
-    for line in lines:
-        if line.startswith(' ') or line.startswith('\t'):
-            # Count leading spaces or tabs
-            indent = ''
-            for char in line:
-                if char in (' ', '\t'):
-                    indent += char
-                else:
-                    break
-            return indent
-    
-    # Default to 2 spaces if no indentation detected
-    return '  '
+@functools.lru_cache(maxsize=None)
+def get_validator(schema_url):
+    """Return a validator compiled once per process for the schema at schema_url, or None."""
+    schema = load_schema(schema_url)
+    if not schema:
+        return None
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
 
-def process_file(file_path):
-    """Process a single JSON file."""
-    print(f"Processing {file_path}")
+@functools.lru_cache(maxsize=None)
+def get_definition_validator(schema_url, definition):
+    """
+    Return a validator for a single definition of the schema at schema_url (e.g. "set"),
+    so a modified subtree can be validated without re-validating the whole document.
+    """
+    schema = load_schema(schema_url)
+    if not schema or definition not in schema.get('definitions', {}):
+        return None
+    subschema = {'$ref': f'#/definitions/{definition}', 'definitions': schema['definitions']}
+    return jsonschema.validators.validator_for(schema)(subschema)
+
+def find_common_attributes(cards):
+    """
+    Return the sorted attributes shared by every card in a single intersection pass.
+    Returns an empty list as soon as a card has no attributes or nothing is left in common.
+    """
+    common = None
+    for card in cards:
+        if 'attributes' not in card:
+            # If any card doesn't have attributes, there can't be common ones
+            return []
+        common = set(card['attributes']) if common is None else common.intersection(card['attributes'])
+        if not common:
+            return []
+    return sorted(common) if common else []
+
+def hoist_set_attributes(card_set, common_attributes):
+    """
+    Return a copy of card_set with common_attributes moved from its cards to the set level.
+    Only the set and card dicts are copied (shallowly); everything else is shared with the
+    original, which is left untouched until the new set has been validated.
+    """
+    hoisted = dict(card_set)
+    # Add attributes to set if not already present, otherwise merge with existing set attributes
+    if 'attributes' not in card_set:
+        hoisted['attributes'] = list(common_attributes)
+    else:
+        existing = set(card_set['attributes'])
+        hoisted['attributes'] = card_set['attributes'] + [attr for attr in common_attributes if attr not in existing]
     
-    # Detect indentation
-    indent_str = detect_indentation(file_path)
+    # Remove common attributes from each card
+    common = set(common_attributes)
+    cards = []
+    for card in card_set['cards']:
+        card = dict(card)
+        card['attributes'] = [attr for attr in card['attributes'] if attr not in common]
+        if not card['attributes']:
+            del card['attributes']
+        cards.append(card)
+    hoisted['cards'] = cards
+    return hoisted
+
+def process_file(file_path, dry_run=False):
+    """
+    Process a single JSON file, moving attributes shared by every card of a set to the set level.
+    Sets are updated in place and only the modified sets are re-validated; the file is only
+    rewritten when something changed. With dry_run, report what would move without writing.
+    Returns (modified, messages): whether the file was (or, with dry_run, would be) modified,
+    and the lines to report for it, so files processed in parallel are reported one at a time.
+    """
+    messages = []
+    log = messages.append
+    log(f"Processing {file_path}")
     
     try:
-        # Load JSON file
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        # Load JSON file, keeping its text to reproduce the formatting and compare on write
+        data, content = load_json(file_path)
         
         # Skip if no schema defined
         if '$schema' not in data:
-            print(f"  No schema defined in {file_path}, skipping")
-            return False
+            log(f"  No schema defined in {file_path}, skipping")
+            return False, messages
         
         # Load and validate schema
-        schema = load_schema(data['$schema'])
-        if not schema:
-            print(f"  Failed to load schema for {file_path}, skipping")
-            return False
+        validator = get_validator(data['$schema'])
+        if not validator:
+            log(f"  Failed to load schema for {file_path}, skipping")
+            return False, messages
         
         try:
-            jsonschema.validate(instance=data, schema=schema)
+            validator.validate(data)
         except jsonschema.exceptions.ValidationError as e:
-            print(f"  JSON validation failed for {file_path}: {e}")
-            return False
+            log(f"  JSON validation failed for {file_path}: {e}")
+            return False, messages
         
-        # Create a copy of the data for modification
-        modified_data = copy.deepcopy(data)
-        modified = False
-        
-        # Process each set
+        # Find the sets whose cards all share some attributes
+        changes = []
         for set_idx, card_set in enumerate(data.get('sets', [])):
             # Skip sets with no cards
             if 'cards' not in card_set or not card_set['cards']:
                 continue
-            
-            # Find common attributes across all cards in the set
-            common_attributes = None
-            for card in card_set['cards']:
-                if 'attributes' not in card:
-                    # If any card doesn't have attributes, there can't be common ones
-                    common_attributes = None
-                    break
-                
-                if common_attributes is None:
-                    # Initialize with the first card's attributes
-                    common_attributes = set(card['attributes'])
-                else:
-                    # Intersect with this card's attributes
-                    common_attributes &= set(card['attributes'])
-            
-            # If common attributes found, move them to set level
-            if common_attributes and common_attributes:
-                common_attributes = sorted(list(common_attributes))
-                
-                # Add attributes to set if not already present
-                if 'attributes' not in modified_data['sets'][set_idx]:
-                    modified_data['sets'][set_idx]['attributes'] = common_attributes
-                else:
-                    # Merge with existing set attributes
-                    existing = set(modified_data['sets'][set_idx]['attributes'])
-                    for attr in common_attributes:
-                        if attr not in existing:
-                            modified_data['sets'][set_idx]['attributes'].append(attr)
-                
-                # Remove common attributes from each card
-                for card_idx, card in enumerate(modified_data['sets'][set_idx]['cards']):
-                    if 'attributes' in card:
-                        card['attributes'] = [attr for attr in card['attributes'] if attr not in common_attributes]
-                        if not card['attributes']:
-                            del card['attributes']
-                
-                modified = True
-                print(f"  Moved {len(common_attributes)} common attributes to set level in set '{card_set['name']}'")
+            common_attributes = find_common_attributes(card_set['cards'])
+            if common_attributes:
+                changes.append((set_idx, common_attributes))
         
-        # Save the modified file if changes were made
-        if modified:
-            # Validate the modified data against the schema before saving
+        if not changes:
+            log(f"  No changes needed for {file_path}")
+            return False, messages
+        
+        if dry_run:
+            for set_idx, common_attributes in changes:
+                log(f"  Would move {len(common_attributes)} common attributes ({', '.join(common_attributes)}) "
+                      f"to set level in set '{data['sets'][set_idx]['name']}'")
+            return True, messages
+        
+        # Build and validate the modified sets before touching the document
+        set_validator = get_definition_validator(data['$schema'], 'set')
+        hoisted_sets = []
+        for set_idx, common_attributes in changes:
+            hoisted = hoist_set_attributes(data['sets'][set_idx], common_attributes)
             try:
-                jsonschema.validate(instance=modified_data, schema=schema)
+                if set_validator:
+                    set_validator.validate(hoisted)
             except jsonschema.exceptions.ValidationError as e:
-                print(f"  Modified JSON failed validation for {file_path}: {e}")
-                print(f"  Skipping modifications to avoid breaking the file")
-                return False
-            
-            # Preserve the original formatting
-            with open(file_path, 'w') as f:
-                json.dump(modified_data, f, indent=indent_str)
-            print(f"  Successfully updated {file_path}")
-            return True
-        else:
-            print(f"  No changes needed for {file_path}")
-            return False
+                log(f"  Modified JSON failed validation for {file_path}: {e}")
+                log(f"  Skipping modifications to avoid breaking the file")
+                return False, messages
+            hoisted_sets.append((set_idx, common_attributes, hoisted))
+        
+        for set_idx, common_attributes, hoisted in hoisted_sets:
+            data['sets'][set_idx] = hoisted
+            log(f"  Moved {len(common_attributes)} common attributes to set level in set '{hoisted['name']}'")
+        
+        # Preserve the original formatting; the file is replaced atomically
+        write_json(file_path, data, content)
+        log(f"  Successfully updated {file_path}")
+        return True, messages
             
     except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+        log(f"Error processing {file_path}: {e}")
+        return False, messages
+
+def process_task(task):
+    """Run process_file on a (file path, dry_run) task; module-level so it can run in a worker process."""
+    return process_file(*task)
 
-def process_directory(directory_path):
-    """Process all JSON files in directory and subdirectories."""
+def process_directory(directory_path, dry_run=False, workers=1):
+    """Process all JSON files in directory and subdirectories, in a pool of workers processes."""
     print(f"Scanning directory: {directory_path}")
     
     # Get all JSON files in directory and subdirectories
-    json_files = glob.glob(os.path.join(directory_path, '**', '*.json'), recursive=True)
+    json_files = sorted(glob.glob(os.path.join(directory_path, '**', '*.json'), recursive=True))
     
     success_count = 0
     total_count = len(json_files)
     
-    for file_path in json_files:
-        if process_file(file_path):
+    for modified, messages in map_files(process_task, [(file_path, dry_run) for file_path in json_files], workers):
+        print("\n".join(messages))
+        if modified:
             success_count += 1
     
-    print(f"\nProcessed {total_count} JSON files, modified {success_count} files")
+    if dry_run:
+        print(f"\nProcessed {total_count} JSON files, {success_count} files would be modified (dry run)")
+    else:
+        print(f"\nProcessed {total_count} JSON files, modified {success_count} files")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python script.py <directory_path>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Move attributes shared by every card in a set up to the set level."
+    )
+    parser.add_argument("directory_path", help="Directory to scan recursively for JSON files")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report which attributes would move without modifying any file")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of processes used to process files (0 = one per CPU, default: 0)")
+    args = parser.parse_args()
     
-    directory_path = sys.argv[1]
+    directory_path = args.directory_path
     if not os.path.isdir(directory_path):
         print(f"Error: {directory_path} is not a valid directory")
         sys.exit(1)
     
-    process_directory(directory_path)
\ No newline at end of file
+    process_directory(directory_path, args.dry_run, args.workers if args.workers > 0 else (os.cpu_count() or 1))
@@ -0,0 +1,75 @@
+import argparse
+import random
+import time
+import pandas as pd
+from card_query import CardIndex, DEFAULT_DATASET
+
+def time_per_call(function, keys):
+    """Call function once per key and return the mean time per call in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare CardIndex lookups with filtering the same dataset in pandas."
+    )
+    parser.add_argument("--dataset", default=DEFAULT_DATASET,
+                        help="Single-file Parquet dataset written by build-parquet.py (default: output/dataset.parquet)")
+    parser.add_argument("--queries", type=int, default=200,
+                        help="Number of random keys looked up per query type (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed used to pick the keys")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = pd.read_parquet(args.dataset)
+    pandas_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = CardIndex.from_parquet(args.dataset)
+    index_load = time.perf_counter() - start
+
+    print(f"{len(index)} records")
+    print(f"Load: pandas {pandas_load:.2f}s, CardIndex {index_load:.2f}s (read and build indexes)")
+
+    rng = random.Random(args.seed)
+    sample = df.sample(n=args.queries, random_state=args.seed)
+    card_ids = sample["card_unique_id"].tolist()
+    set_ids = sample["set_unique_id"].tolist()
+    release_ids = sample["release_unique_id"].tolist()
+    numbers = list(zip(sample["release_unique_id"], sample["card_number"]))
+    # Search for one word of the sampled names, as a collector typing a surname would.
+    players = [rng.choice(name.split() or [name]) for name in sample["card_name"]]
+
+    # Each pandas query is the boolean-mask filter a caller would otherwise write. Card and
+    # number lookups return record dicts; queries that match many rows return an Arrow table,
+    # as pandas returns a frame.
+    benchmarks = [
+        ("card uniqueId",
+         lambda key: df[df["card_unique_id"] == key],
+         index.card, card_ids),
+        ("set uniqueId",
+         lambda key: df[df["set_unique_id"] == key],
+         lambda key: index.take(index.set_rows(key)), set_ids),
+        ("release uniqueId",
+         lambda key: df[df["release_unique_id"] == key],
+         lambda key: index.take(index.release_rows(key)), release_ids),
+        ("(release, number)",
+         lambda key: df[(df["release_unique_id"] == key[0]) & (df["card_number"] == key[1])],
+         lambda key: index.cards_by_number(*key), numbers),
+        ("player name",
+         lambda key: df[df["card_name"].str.contains(key, case=False, regex=False)],
+         lambda key: index.take(index.player_rows(key)), players),
+    ]
+
+    # pandas filters scan the whole frame, so they get a smaller slice of the keys.
+    pandas_queries = max(1, args.queries // 10)
+    print(f"{'query':<20}{'pandas (us)':>14}{'CardIndex (us)':>16}{'speedup':>10}")
+    for name, pandas_query, index_query, keys in benchmarks:
+        pandas_us = time_per_call(pandas_query, keys[:pandas_queries])
+        index_us = time_per_call(index_query, keys)
+        print(f"{name:<20}{pandas_us:>14.1f}{index_us:>16.1f}{pandas_us / index_us:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
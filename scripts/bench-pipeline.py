@@ -0,0 +1,427 @@
+"""
+Benchmark the data pipeline on synthetic corpora scaled from the categories/ tree.
+
+    python bench-pipeline.py run --scale 1 10
+    python bench-pipeline.py run --scale 1 --save-baseline
+
+A corpus at scale N holds N copies of every release and category file under categories/.
+Each copy keeps the exact shape of its source release (sets, cards, set-level and card-level
+parallels, variations and attributes), so the fan-out the pipeline sees is the real one. Every
+uniqueId is replaced with a fresh UUID, and copies after the first are renamed
+"<name> Synthetic <n>", so a corpus stays schema-valid and free of duplicate IDs. A Panini-style
+checklist CSV is also written for every release: one row per card of each set, parallel and
+variation, with every other file using the "PARALLEL OF" column. Corpora are generated from
+a fixed seed under output/bench/<N>x/ and regenerated when categories/ changes.
+
+Every case runs in a fresh process on a single worker: first timed repeat times (the fastest
+is kept), then once more under tracemalloc for the peak of Python allocations. The process's
+peak RSS, which also covers Arrow and numpy buffers, is reported alongside. Results are
+compared per card with the stored baseline, so a growing categories/ tree does not read as a
+regression.
+"""
+import argparse
+import contextlib
+import csv
+import hashlib
+import importlib.util
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+import json_codec
+from json_rewrite import dumps_like, load_json, map_files, write_json
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+DEFAULT_CATEGORIES_DIR = REPO_DIR / "categories"
+DEFAULT_OUTPUT_DIR = REPO_DIR / "output" / "bench"
+DEFAULT_BASELINE = SCRIPTS_DIR / "bench-baseline.json"
+
+# Bump GENERATOR_VERSION whenever the generated corpus changes, so cached corpora are rebuilt.
+GENERATOR_VERSION = 1
+BASELINE_VERSION = 1
+CHECKLIST_COLUMNS = ["YEAR", "BRAND", "PROGRAM", "SPORT", "CARD SET", "CARD NUMBER", "ATHLETE", "SEQUENCE"]
+MB = 1024 * 1024
+
+def load_script(filename):
+    """Import one of the hyphen-named scripts as a module."""
+    spec = importlib.util.spec_from_file_location(filename[:-3].replace("-", "_"), SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def call_main(module, *argv):
+    """Run the main() of a script with these command-line arguments, ignoring its exit code."""
+    saved = sys.argv
+    sys.argv = [module.__file__, *argv]
+    try:
+        module.main()
+    except SystemExit:
+        pass
+    finally:
+        sys.argv = saved
+
+def run_build(module, corpus_dir):
+    call_main(module, "--categories-dir", str(corpus_dir / "categories"),
+              "--output-dir", str(corpus_dir / "output"), "--workers", "1")
+
+def run_validate(module, corpus_dir):
+    call_main(module, str(corpus_dir / "categories" / "*" / "*" / "*.json"), "--no-cache", "--workers", "1")
+
+def run_cleanup(module, corpus_dir):
+    # A dry run does all the reading, schema validation and attribute matching, but leaves the
+    # corpus untouched for the next run.
+    module.process_directory(str(corpus_dir / "categories"), dry_run=True, workers=1)
+
+def run_csv_import(module, corpus_dir):
+    for path in sorted((corpus_dir / "checklists").glob("*/*.csv")):
+        module.process_csv_with_pandas(path)
+
+# Case name -> (script, function running the case on a corpus directory)
+CASES = {
+    "build": ("build-parquet.py", run_build),
+    "validate": ("validate-json-data.py", run_validate),
+    "cleanup": ("attribute-cleanup.py", run_cleanup),
+    "csv-import": ("parse-panini-checklist-csv.py", run_csv_import),
+}
+
+def source_files(categories_dir):
+    """Return (release files, category files) under categories_dir, sorted."""
+    return sorted(categories_dir.glob("*/*/*.json")), sorted(categories_dir.glob("*.json"))
+
+def source_digest(categories_dir):
+    """Return the SHA-256 hex digest of the names and contents of the source files."""
+    digest = hashlib.sha256()
+    for path in sum(source_files(categories_dir), []):
+        digest.update(path.relative_to(categories_dir).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def reidentify(node, ids, rng):
+    """
+    Return a copy of node with every uniqueId replaced. ids maps old to new uniqueIds, so a
+    uniqueId repeated within a copy (e.g. a release and its category entry) stays consistent.
+    """
+    if isinstance(node, dict):
+        copy = {}
+        for key, value in node.items():
+            if key == "uniqueId" and isinstance(value, str):
+                new_id = ids.get(value)
+                if new_id is None:
+                    new_id = ids[value] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+                copy[key] = new_id
+            else:
+                copy[key] = reidentify(value, ids, rng)
+        return copy
+    if isinstance(node, list):
+        return [reidentify(value, ids, rng) for value in node]
+    return node
+
+def copy_name(name, copy):
+    return name if copy == 0 else f"{name} Synthetic {copy}"
+
+def checklist_rows(card_set):
+    """
+    Yield (card set, card number, athlete, sequence, parallel of) for one set, the way Panini
+    lists it: the base cards, then every card again for each set-level parallel, then the
+    card-level parallels and the variations grouped by name.
+    """
+    set_name = card_set["name"]
+    cards = card_set.get("cards", [])
+    base = [(card.get("number", ""), card["name"], card.get("numberedTo", card_set.get("numberedTo", "")))
+            for card in cards]
+    for number, athlete, sequence in base:
+        yield set_name, number, athlete, sequence, ""
+    for parallel in card_set.get("parallels", []):
+        for number, athlete, _ in base:
+            yield f"{set_name} {parallel['name']}", number, athlete, parallel.get("numberedTo", ""), set_name
+    grouped = {}
+    for card, (number, athlete, _) in zip(cards, base):
+        for parallel in card.get("parallels", []):
+            grouped.setdefault(parallel["name"], []).append((number, athlete, parallel.get("numberedTo", "")))
+        for variation in card.get("variations", []):
+            grouped.setdefault("Variation", []).append((number, athlete, variation.get("numberedTo", "")))
+    for name, rows in grouped.items():
+        for number, athlete, sequence in rows:
+            yield f"{set_name} {name}", number, athlete, sequence, set_name
+
+def write_checklist(path, category, year, program, release, parallel_of):
+    """Write the checklist CSV of a release; return the number of rows."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = CHECKLIST_COLUMNS + (["PARALLEL OF"] if parallel_of else [])
+    metadata = [year, program.split()[0], program, category.capitalize()]
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for card_set in release.get("sets", []):
+            for row in checklist_rows(card_set):
+                writer.writerow(metadata + list(row if parallel_of else row[:-1]))
+                count += 1
+    return count
+
+def generate_copy(task):
+    """
+    Write one copy of every release of source_dir (and its checklist) under target_dir.
+    task is a (source_dir, target_dir, copy, seed) tuple; runs in the worker processes, so it
+    must stay a module-level function. Returns (cards, checklist rows, reidentified category
+    documents by file name) so the category files can be assembled from every copy.
+    """
+    source_dir, target_dir, copy, seed = task
+    rng = random.Random(f"{seed}-{copy}")
+    ids = {}
+    cards = rows = 0
+    release_files, category_files = source_files(source_dir)
+    for index, source in enumerate(release_files):
+        data, original = load_json(source)
+        release = reidentify(data, ids, rng)
+        if "name" in release:
+            release["name"] = copy_name(release["name"], copy)
+        category, year = source.relative_to(source_dir).parts[:2]
+        stem = source.stem if copy == 0 else f"{source.stem}-Synthetic-{copy}"
+        target = target_dir / "categories" / category / year / f"{stem}.json"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "w", encoding="utf-8", newline="") as f:
+            f.write(dumps_like(release, original))
+        cards += sum(len(card_set.get("cards", [])) for card_set in release.get("sets", []))
+        program = (stem[len(year) + 1:] if stem.startswith(f"{year}-") else stem).replace("-", " ")
+        rows += write_checklist(target_dir / "checklists" / category / f"{stem}.csv",
+                                category, year, program, release, parallel_of=index % 2 == 1)
+
+    categories = {}
+    for source in category_files:
+        document = reidentify(json_codec.load_path(source), ids, rng)
+        for year in document.get("category", {}).get("years", []):
+            for entry in year.get("releases", []):
+                entry["name"] = copy_name(entry["name"], copy)
+        categories[source.name] = document
+    return cards, rows, categories
+
+def generate_corpus(source_dir, corpus_dir, scale, seed, workers):
+    """Write a corpus of scale copies of source_dir to corpus_dir; return (releases, cards, rows)."""
+    tasks = [(source_dir, corpus_dir, copy, seed) for copy in range(scale)]
+    cards = rows = 0
+    merged = {}
+    for copy_cards, copy_rows, categories in map_files(generate_copy, tasks, workers):
+        cards += copy_cards
+        rows += copy_rows
+        for name, document in categories.items():
+            if name not in merged:
+                merged[name] = document
+                continue
+            # Append the entries of this copy to the same year of the first copy.
+            years = merged[name].get("category", {}).get("years", [])
+            for year, copy_year in zip(years, document.get("category", {}).get("years", [])):
+                year.setdefault("releases", []).extend(copy_year.get("releases", []))
+
+    for name, document in merged.items():
+        with open(source_dir / name, encoding="utf-8") as f:
+            original = f.read()
+        with open(corpus_dir / "categories" / name, "w", encoding="utf-8", newline="") as f:
+            f.write(dumps_like(document, original))
+    return len(source_files(source_dir)[0]) * scale, cards, rows
+
+def ensure_corpus(source_dir, corpus_dir, scale, seed, workers):
+    """
+    Return the description of the corpus in corpus_dir, generating it first unless it was
+    already generated at this scale and seed from the current source_dir.
+    """
+    marker = corpus_dir / "corpus.json"
+    expected = {"version": GENERATOR_VERSION, "scale": scale, "seed": seed, "source": source_digest(source_dir)}
+    try:
+        corpus = json_codec.load_path(marker)
+        if {key: corpus.get(key) for key in expected} == expected:
+            return corpus
+    except (OSError, ValueError):
+        pass
+
+    print(f"Generating the {scale}x corpus in {corpus_dir}...")
+    start = time.perf_counter()
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    releases, cards, rows = generate_corpus(source_dir, corpus_dir, scale, seed, workers)
+    corpus = dict(expected, releases=releases, cards=cards, checklist_rows=rows)
+    # The marker is written last, so an interrupted generation is started over next time.
+    write_json(marker, corpus, indent=2)
+    print(f"Generated in {time.perf_counter() - start:.1f}s")
+    return corpus
+
+def max_rss_mb():
+    """Return the peak resident set size of this process in MB, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / MB if sys.platform == "darwin" else rss / 1024
+
+def measure(case, corpus_dir, repeat):
+    """Run a case repeat times, then once under tracemalloc; return its metrics."""
+    filename, function = CASES[case]
+    module = load_script(filename)
+    times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(module, corpus_dir)
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            function(module, corpus_dir)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    rss = max_rss_mb()
+    return {
+        "seconds": round(min(times), 3),
+        "peak_mb": round(peak / MB, 1),
+        "max_rss_mb": None if rss is None else round(rss, 1),
+    }
+
+def measure_in_subprocess(case, corpus_dir, repeat):
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "measure", case, str(corpus_dir), "--repeat", str(repeat)],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"Case {case} failed:\n{result.stdout}{result.stderr}")
+        sys.exit(1)
+    return json_codec.loads(result.stdout.strip().splitlines()[-1])
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "orjson": json_codec.orjson is not None,
+    }
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """
+    Print every metric against the baseline, scaled to the baseline's card count, and return
+    the list of regressions: (scale, case, metric, ratio) beyond the tolerances.
+    """
+    regressions = []
+    for scale, result in results.items():
+        base = baseline.get("results", {}).get(scale)
+        if base is None:
+            print(f"{scale}: no baseline")
+            continue
+        if base["source"] != result["source"]:
+            print(f"{scale}: categories/ changed since the baseline ({base['cards']} -> {result['cards']} cards), "
+                  f"comparing per card")
+        factor = base["cards"] / result["cards"]
+        for case, metrics in result["cases"].items():
+            base_metrics = base["cases"].get(case)
+            if base_metrics is None:
+                print(f"{scale} {case}: no baseline")
+                continue
+            changes = []
+            for metric, tolerance in (("seconds", time_tolerance), ("peak_mb", memory_tolerance)):
+                if not base_metrics[metric]:
+                    continue
+                ratio = metrics[metric] * factor / base_metrics[metric]
+                changes.append(f"{metric} {ratio - 1:+.0%}")
+                if ratio > 1 + tolerance:
+                    regressions.append((scale, case, metric, ratio))
+            flag = " REGRESSION" if any(r[:2] == (scale, case) for r in regressions) else ""
+            print(f"{scale} {case:<10} vs baseline: {', '.join(changes)}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time and memory-profile the build, validation, cleanup and CSV import on synthetic corpora.")
+    parser.add_argument("--categories-dir", type=Path, default=DEFAULT_CATEGORIES_DIR,
+                        help="Source tree the corpora are scaled from (default: categories/)")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help="Directory the corpora are generated in (default: output/bench/)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated uniqueIds (default: 0)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of processes used to generate corpora (0 = one per CPU, default: 0)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="Generate the corpora without running the benchmarks")
+    generate.add_argument("--scale", type=int, nargs="+", default=[1],
+                          help="Corpus sizes as multiples of the source tree, e.g. 1 10 100 (default: 1)")
+    run = commands.add_parser("run", help="Run the benchmarks and compare them with the baseline")
+    run.add_argument("--scale", type=int, nargs="+", default=[1],
+                     help="Corpus sizes as multiples of the source tree, e.g. 1 10 100 (default: 1)")
+    run.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES),
+                     help="Cases to run (default: all)")
+    run.add_argument("--repeat", type=int, default=3, help="Timed runs per case, the fastest is kept (default: 3)")
+    run.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                     help="Baseline results file (default: scripts/bench-baseline.json)")
+    run.add_argument("--save-baseline", action="store_true",
+                     help="Store these results as the baseline of the scales run instead of comparing")
+    run.add_argument("--tolerance", type=float, default=0.2,
+                     help="Relative slowdown per card reported as a regression (default: 0.2)")
+    run.add_argument("--memory-tolerance", type=float, default=0.1,
+                     help="Relative growth of the traced memory peak per card reported as a regression (default: 0.1)")
+    measure_parser = commands.add_parser("measure", help="Measure one case on a generated corpus and print JSON")
+    measure_parser.add_argument("case", choices=list(CASES))
+    measure_parser.add_argument("corpus_dir", type=Path)
+    measure_parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    if args.command == "measure":
+        print(json_codec.dumps(measure(args.case, args.corpus_dir, args.repeat)))
+        return
+
+    if any(scale < 1 for scale in args.scale):
+        print("Error: --scale values must be at least 1")
+        sys.exit(1)
+    corpora = {}
+    for scale in args.scale:
+        corpus_dir = args.output_dir / f"{scale}x"
+        corpus = ensure_corpus(args.categories_dir, corpus_dir, scale, args.seed, workers)
+        print(f"{scale}x corpus: {corpus['releases']} releases, {corpus['cards']} cards, "
+              f"{corpus['checklist_rows']} checklist rows")
+        corpora[scale] = (corpus_dir, corpus)
+    if args.command == "generate":
+        return
+
+    results = {}
+    for scale, (corpus_dir, corpus) in corpora.items():
+        cases = {}
+        for case in args.cases:
+            metrics = cases[case] = measure_in_subprocess(case, corpus_dir, args.repeat)
+            rss = "" if metrics["max_rss_mb"] is None else f", peak RSS {metrics['max_rss_mb']:.1f} MB"
+            print(f"{scale}x {case:<10} {metrics['seconds']:.3f}s, traced peak {metrics['peak_mb']:.1f} MB{rss}")
+        results[f"{scale}x"] = {"cards": corpus["cards"], "source": corpus["source"], "cases": cases}
+
+    if args.save_baseline:
+        try:
+            baseline = json_codec.load_path(args.baseline)
+        except (OSError, ValueError):
+            baseline = {}
+        baseline["version"] = BASELINE_VERSION
+        baseline["environment"] = environment()
+        for scale, result in results.items():
+            stored = baseline.setdefault("results", {}).setdefault(scale, {})
+            # Keep the stored cases that were not run this time, unless the corpus changed.
+            cases = stored.get("cases", {}) if stored.get("source") == result["source"] else {}
+            stored.update(result, cases=dict(cases, **result["cases"]))
+        write_json(args.baseline, baseline, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    try:
+        baseline = json_codec.load_path(args.baseline)
+    except (OSError, ValueError):
+        print(f"No baseline in {args.baseline}; run with --save-baseline to create one")
+        return
+    if baseline.get("environment") != environment():
+        print(f"Warning: the baseline was measured on a different setup: {baseline.get('environment')}")
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+    if regressions:
+        print(f"{len(regressions)} regressions beyond the tolerances")
+        sys.exit(1)
+    print("No regressions")
+
+if __name__ == "__main__":
+    main()
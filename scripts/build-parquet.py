@@ -1,195 +1,918 @@
-import json
+import argparse
+from collections import deque
+from itertools import islice
+from array import array
+import hashlib
+import os
+import shutil
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import sys
-import uuid  # Add this import to generate new unique IDs
+import uuid
+import json_codec
+from name_search import NameIndexBuilder
+
+# Incremental builds keep their manifest and per-release fragments under output/.cache.
+# Bump FRAGMENT_VERSION whenever flatten_card_data changes its output so stale fragments are rebuilt.
+CACHE_DIRNAME = ".cache"
+MANIFEST_NAME = "manifest.json"
+FRAGMENT_VERSION = 5
+
+# Version of the output/stats.json layout; bump it when the keys change.
+STATS_VERSION = 1
+
+# Arrow schema of the flattened records. Every per-release table conforms to it, so tables
+# produced by different workers (or read back from cached fragments) concatenate cleanly.
+# Low-cardinality string columns are dictionary-encoded to keep the in-memory build small.
+RECORD_SCHEMA = pa.schema([
+    ("category", pa.dictionary(pa.int32(), pa.string())),
+    ("release_unique_id", pa.dictionary(pa.int32(), pa.string())),
+    ("year", pa.dictionary(pa.int32(), pa.string())),
+    ("release", pa.dictionary(pa.int32(), pa.string())),
+    ("release_name", pa.dictionary(pa.int32(), pa.string())),
+    ("set_unique_id", pa.dictionary(pa.int32(), pa.string())),
+    ("set", pa.dictionary(pa.int32(), pa.string())),
+    ("card_unique_id", pa.string()),
+    ("card_parent_unique_id", pa.string()),
+    ("card_number", pa.string()),
+    ("card_name", pa.string()),
+    ("attributes", pa.list_(pa.string())),
+    ("note", pa.string()),
+    ("parallel", pa.dictionary(pa.int32(), pa.string())),
+    ("numberedTo", pa.int64()),
+    ("insertOdds", pa.list_(pa.struct([("product", pa.string()), ("odds", pa.string())]))),
+    ("_is_variation", pa.bool_()),
+])
+DICTIONARY_COLUMNS = [field.name for field in RECORD_SCHEMA if pa.types.is_dictionary(field.type)]
+
+# Schema of the written dataset: the record columns as plain strings, without '_is_variation'.
+# numberedTo stays a double, as in the datasets previously written through pandas.
+OUTPUT_SCHEMA = pa.schema([
+    pa.field(field.name, pa.float64() if field.name == "numberedTo"
+             else field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+    for field in RECORD_SCHEMA if field.name != "_is_variation"
+])
+
+# Schema of the files in a Hive-partitioned dataset, where category and year live in the path.
+PARTITIONED_SCHEMA = pa.schema([field for field in OUTPUT_SCHEMA if field.name not in ("category", "year")])
+
+# Parquet layout: row groups of DEFAULT_ROW_GROUP_SIZE rows, with min/max statistics kept for
+# the columns readers filter on so whole row groups can be skipped.
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+STATISTICS_COLUMNS = ["category", "year", "release", "set_unique_id", "card_unique_id"]
+
+# Namespace for the name-based (UUIDv5) IDs derived for parallel and variation rows and for
+# cards missing a uniqueId. Never change it: every derived card_unique_id depends on it.
+CARD_ID_NAMESPACE = uuid.UUID("cb734ffa-69fc-46c5-8597-50c4153d361a")
+
+def derive_unique_id(*parts):
+    """
+    Derive a deterministic unique ID from the given name parts using UUIDv5,
+    so the same input JSON always produces the same IDs.
+    """
+    return str(uuid.uuid5(CARD_ID_NAMESPACE, "/".join(str(part) for part in parts)))
+
+def occurrence_key(name, seen):
+    """
+    Return a key for name that stays unique within one parent: the first occurrence
+    is the name itself, repeats get a "#<n>" suffix. seen is updated in place.
+    """
+    count = seen.get(name, 0) + 1
+    seen[name] = count
+    return name if count == 1 else f"{name}#{count}"
+
+class CardTableBuilder:
+    """
+    Columnar builder for the flattened records of one release.
+
+    Rows are appended straight into per-column buffers instead of per-row dicts:
+    low-cardinality string columns (category, release, set, parallel, ...) are stored as
+    int32 dictionary codes, attributes as a flat value list plus offsets, and the remaining
+    columns as plain lists. to_table() turns the buffers into a pyarrow.Table matching
+    RECORD_SCHEMA without ever materializing a row.
+    """
+
+    def __init__(self):
+        self._dictionaries = {name: {} for name in DICTIONARY_COLUMNS}
+        self._codes = {name: array("i") for name in DICTIONARY_COLUMNS}
+        self._current = {}
+        self._strings = {name: [] for name in ("card_unique_id", "card_parent_unique_id", "card_number", "card_name", "note")}
+        self._attribute_offsets = array("i", [0])
+        self._attribute_values = []
+        self._numbered_to = []
+        self._insert_odds = []
+        self._is_variation = []
+
+    def _code(self, column, value):
+        codes = self._dictionaries[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def start_release(self, category, year, release, release_name, release_unique_id):
+        """Set the release-level columns for the rows appended next."""
+        for column, value in (("category", category), ("year", year), ("release", release),
+                              ("release_name", release_name), ("release_unique_id", release_unique_id)):
+            self._current[column] = self._code(column, value)
+
+    def start_set(self, set_unique_id, set_name):
+        """Set the set-level columns for the rows appended next."""
+        self._current["set_unique_id"] = self._code("set_unique_id", set_unique_id)
+        self._current["set"] = self._code("set", set_name)
+
+    def append(self, card_unique_id, card_parent_unique_id, card_number, card_name, attributes,
+               note, parallel, numbered_to, insert_odds, is_variation):
+        """Append one flattened row for the current release and set."""
+        for column in ("category", "year", "release", "release_name", "release_unique_id", "set_unique_id", "set"):
+            self._codes[column].append(self._current[column])
+        self._codes["parallel"].append(self._code("parallel", parallel))
+        strings = self._strings
+        strings["card_unique_id"].append(card_unique_id)
+        strings["card_parent_unique_id"].append(card_parent_unique_id)
+        strings["card_number"].append(card_number)
+        strings["card_name"].append(card_name)
+        strings["note"].append(note)
+        self._attribute_values.extend(attributes)
+        self._attribute_offsets.append(len(self._attribute_values))
+        self._numbered_to.append(numbered_to)
+        self._insert_odds.append(insert_odds)
+        self._is_variation.append(is_variation)
+
+    def to_table(self):
+        """Build a pyarrow.Table conforming to RECORD_SCHEMA from the buffered columns."""
+        columns = {}
+        for column in DICTIONARY_COLUMNS:
+            columns[column] = pa.DictionaryArray.from_arrays(
+                pa.array(self._codes[column], type=pa.int32()),
+                pa.array(list(self._dictionaries[column]), type=pa.string()),
+            )
+        for column, values in self._strings.items():
+            columns[column] = pa.array(values, type=pa.string())
+        columns["attributes"] = pa.ListArray.from_arrays(
+            pa.array(self._attribute_offsets, type=pa.int32()),
+            pa.array(self._attribute_values, type=pa.string()),
+        )
+        columns["numberedTo"] = pa.array(self._numbered_to, type=RECORD_SCHEMA.field("numberedTo").type)
+        columns["insertOdds"] = pa.array(self._insert_odds, type=RECORD_SCHEMA.field("insertOdds").type)
+        columns["_is_variation"] = pa.array(self._is_variation, type=pa.bool_())
+        return pa.Table.from_arrays([columns[name] for name in RECORD_SCHEMA.names], schema=RECORD_SCHEMA)
 
 def flatten_card_data(category, year, release, json_data):
     """
-    Iterate over each set and each card to create flat records.
-    For every card, a base record is always created using the updated base_record.
+    Iterate over each set and each card to create flat records, returned as a pyarrow.Table
+    conforming to RECORD_SCHEMA (built column by column with CardTableBuilder).
+    For every card, a base record is always created.
     Then, additional records for parallels and variations are created.
     
     Variation records have a modified card_name (appending the variation name in parenthesis)
     and a combined attributes list (base attributes plus any variation attributes, then "VAR").
     
     For parallel records, if the parallel object defines a "numberedTo" value or an "insertOdds" array,
-    they are applied to the record.
+    they are applied to the record. Parallels of a variation otherwise inherit the variation's values.
     
     Parallel cards get their own unique ID and maintain a reference to their parent card.
+    Parallel and variation IDs (and IDs for cards missing a "uniqueId") are derived with
+    UUIDv5 from the parent card ID plus the parallel/variation name, so rebuilding the same
+    JSON always yields the same card_unique_id values.
     
-    A temporary field '_is_variation' is used internally for duplicate checking,
+    A temporary column '_is_variation' is used internally for duplicate checking,
     but will be removed before writing the final output.
     """
-    records = []
-    source = json_data.get("name", "")
+    builder = CardTableBuilder()
+    builder.start_release(category, year, release, json_data.get("name", ""), json_data.get("uniqueId", ""))
 
     for card_set in json_data.get("sets", []):
         set_name = card_set.get("name", "")
+        builder.start_set(card_set.get("uniqueId", ""), set_name)
+        set_attributes = card_set.get("attributes", [])
         # Get set-level parallels that apply to all cards/variations.
         set_parallels = card_set.get("parallels", [])
-        for card in card_set.get("cards", []):
+        for card_index, card in enumerate(card_set.get("cards", [])):
             base_card_name = card.get("name", "")
-            # Get or generate base card unique ID
+            card_number = card.get("number", "")
+            # Get or derive base card unique ID from its position in the release.
             base_card_unique_id = card.get("uniqueId", "")
             if not base_card_unique_id:
-                base_card_unique_id = str(uuid.uuid4())
-                
-            # Updated base record with GUID fields.
-            base_record = {
-                "category": category,
-                "release_unique_id": json_data.get("uniqueId", ""),
-                "year": year,
-                "release": release,
-                "release_name": source,
-                "set_unique_id": card_set.get("uniqueId", ""),
-                "set": set_name,
-                "card_unique_id": base_card_unique_id,
-                "card_parent_unique_id": "",  # Base cards don't have a parent
-                "card_number": card.get("number", ""),
-                "card_name": base_card_name,
-                "attributes": card_set.get("attributes", []) + card.get("attributes", []),
-                "note": card.get("note", ""),
-                "parallel": "",
-                "_is_variation": False
-            }
-            records.append(base_record)
+                base_card_unique_id = derive_unique_id(
+                    json_data.get("uniqueId", ""), card_set.get("uniqueId", set_name),
+                    card_index, card_number, base_card_name
+                )
+            base_attributes = set_attributes + card.get("attributes", [])
+            base_note = card.get("note", "")
+
+            # Base cards don't have a parent.
+            builder.append(base_card_unique_id, "", card_number, base_card_name, base_attributes,
+                           base_note, "", None, None, False)
 
             # Add parallels for the base card: combine card-level and set-level parallels.
-            base_parallels = card.get("parallels", [])
-            all_base_parallels = base_parallels + set_parallels
-            for parallel in all_base_parallels:
-                parallel_record = base_record.copy()
-                # Generate a new unique ID for the parallel
-                parallel_record["card_unique_id"] = str(uuid.uuid4())
-                # Link back to the parent card
-                parallel_record["card_parent_unique_id"] = base_card_unique_id
-                parallel_record["parallel"] = parallel.get("name", "")
-                # Apply parallel's numberedTo if provided.
-                if "numberedTo" in parallel:
-                    parallel_record["numberedTo"] = parallel["numberedTo"]
-                # Apply parallel's insertOdds if provided.
-                if "insertOdds" in parallel:
-                    parallel_record["insertOdds"] = parallel["insertOdds"]
-                parallel_record["_is_variation"] = False
-                records.append(parallel_record)
+            seen_parallels = {}
+            for parallel in card.get("parallels", []) + set_parallels:
+                # Derive the parallel's unique ID from the parent card and parallel name
+                parallel_key = occurrence_key(parallel.get("name", ""), seen_parallels)
+                builder.append(
+                    derive_unique_id(base_card_unique_id, "parallel", parallel_key), base_card_unique_id,
+                    card_number, base_card_name, base_attributes, base_note, parallel.get("name", ""),
+                    parallel.get("numberedTo"), parallel.get("insertOdds"), False
+                )
             
             # Process variations for the card.
+            seen_variations = {}
             for variation in card.get("variations", []):
                 variation_name = variation.get("variation", "")
-                # Generate a unique ID for the variation
-                variation_unique_id = str(uuid.uuid4())
-                
-                variation_record = base_record.copy()
-                variation_record["card_unique_id"] = variation_unique_id
-                variation_record["card_parent_unique_id"] = base_card_unique_id
+                # Derive the variation's unique ID from the parent card and variation name
+                variation_key = occurrence_key(variation_name, seen_variations)
+                variation_unique_id = derive_unique_id(base_card_unique_id, "variation", variation_key)
                 
                 # Update card_name: append the variation name in parenthesis.
-                if variation_name:
-                    variation_record["card_name"] = f"{base_card_name} ({variation_name})"
-                else:
-                    variation_record["card_name"] = base_card_name
+                variation_card_name = f"{base_card_name} ({variation_name})" if variation_name else base_card_name
 
                 # Combine attributes: base attributes plus any variation attributes, then append "VAR".
-                combined_attributes = base_record["attributes"].copy() if base_record["attributes"] else []
-                if variation.get("attributes"):
-                    combined_attributes.extend(variation.get("attributes"))
-                combined_attributes.append("VAR")
-                variation_record["attributes"] = combined_attributes
+                variation_attributes = base_attributes + (variation.get("attributes") or []) + ["VAR"]
 
                 # Override note if the variation has its own.
-                if variation.get("note"):
-                    variation_record["note"] = variation.get("note")
-                # Carry over additional properties if present.
-                if "insertOdds" in variation:
-                    variation_record["insertOdds"] = variation.get("insertOdds")
-                if "numberedTo" in variation:
-                    variation_record["numberedTo"] = variation.get("numberedTo")
-                # Mark as a variation.
-                variation_record["_is_variation"] = True
-                variation_record["parallel"] = ""
-                records.append(variation_record)
+                variation_note = variation.get("note") or base_note
+                variation_numbered_to = variation.get("numberedTo")
+                variation_insert_odds = variation.get("insertOdds")
+                builder.append(variation_unique_id, base_card_unique_id, card_number, variation_card_name,
+                               variation_attributes, variation_note, "", variation_numbered_to,
+                               variation_insert_odds, True)
                 
                 # Add parallels for the variation: combine variation-level and set-level parallels.
-                variation_parallels = variation.get("parallels", [])
-                all_variation_parallels = variation_parallels + set_parallels
-                for v_parallel in all_variation_parallels:
-                    v_par_record = variation_record.copy()
-                    # Generate a new unique ID for the variation's parallel
-                    v_par_record["card_unique_id"] = str(uuid.uuid4())
-                    # Link back to the variation as the parent
-                    v_par_record["card_parent_unique_id"] = variation_unique_id
-                    
-                    v_par_record["parallel"] = v_parallel.get("name", "")
-                    # Apply parallel's numberedTo if provided.
-                    if "numberedTo" in v_parallel:
-                        v_par_record["numberedTo"] = v_parallel["numberedTo"]
-                    # Apply parallel's insertOdds if provided.
-                    if "insertOdds" in v_parallel:
-                        v_par_record["insertOdds"] = v_parallel["insertOdds"]
-                    v_par_record["_is_variation"] = True
-                    records.append(v_par_record)
-    return records
+                seen_v_parallels = {}
+                for v_parallel in variation.get("parallels", []) + set_parallels:
+                    # Derive the variation parallel's unique ID from the variation and parallel name
+                    v_parallel_key = occurrence_key(v_parallel.get("name", ""), seen_v_parallels)
+                    builder.append(
+                        derive_unique_id(variation_unique_id, "parallel", v_parallel_key), variation_unique_id,
+                        card_number, variation_card_name, variation_attributes, variation_note,
+                        v_parallel.get("name", ""),
+                        v_parallel.get("numberedTo", variation_numbered_to),
+                        v_parallel.get("insertOdds", variation_insert_odds), True
+                    )
+    return builder.to_table()
+
+def iter_release_files(categories_dir):
+    """
+    Yield (category, year, release, json_file) for every release JSON file found under
+    categories_dir, following the <category>/<year>/<year>-<release>.json layout.
+    Files are yielded in sorted order so builds are reproducible across filesystems.
+    """
+    for category_dir in sorted(categories_dir.iterdir()):
+        if category_dir.is_dir():
+            for year_dir in sorted(category_dir.iterdir()):
+                if year_dir.is_dir():
+                    for json_file in sorted(year_dir.glob("*.json")):
+                        parts = json_file.stem.split("-", 1)
+                        release = parts[1] if len(parts) == 2 else parts[0]
+                        yield category_dir.name, year_dir.name, release, json_file
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file's raw bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(cache_dir):
+    """
+    Load the incremental build manifest from cache_dir.
+    Returns an empty manifest if none exists or it was written by a different
+    FRAGMENT_VERSION (in which case every fragment is rebuilt).
+    """
+    manifest_path = cache_dir / MANIFEST_NAME
+    try:
+        manifest = json_codec.load_path(manifest_path)
+    except (OSError, ValueError):
+        return {"version": FRAGMENT_VERSION, "releases": {}}
+    if manifest.get("version") != FRAGMENT_VERSION:
+        return {"version": FRAGMENT_VERSION, "releases": {}}
+    return manifest
+
+def save_manifest(cache_dir, manifest):
+    """Write the incremental build manifest to cache_dir."""
+    manifest_path = cache_dir / MANIFEST_NAME
+    with manifest_path.open("w", encoding="utf-8") as f:
+        json_codec.dump(manifest, f, indent=2, sort_keys=True)
+
+def build_release_table(task):
+    """
+    Load and flatten a single release into an Arrow table conforming to RECORD_SCHEMA.
+    task is a (category, year, release, json_file) tuple as yielded by iter_release_files.
+    This runs inside the worker processes of the parallel build, so it must stay a
+    module-level function.
+    """
+    category, year, release, json_file = task
+    try:
+        data = json_codec.load_path(json_file)
+        return flatten_card_data(category, year, release, data)
+    except Exception as e:
+        raise RuntimeError(f"Error processing {json_file}: {e}") from e
+
+def build_release_tables(tasks, workers):
+    """
+    Flatten every task into an Arrow table, yielding the tables in the same order as tasks.
+
+    With workers > 1 the releases are flattened by a process pool. Tasks are submitted in
+    order through a sliding window of 2 * workers releases, so the pool stays busy while the
+    parent holds at most that many finished tables. Results are always yielded in task order,
+    so the output does not depend on the worker count.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield build_release_table(task)
+        return
+
+    window = 2 * workers
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        remaining = iter(tasks)
+        for task in islice(remaining, window):
+            pending.append(executor.submit(build_release_table, task))
+        while pending:
+            table = pending.popleft().result()
+            for task in islice(remaining, 1):
+                pending.append(executor.submit(build_release_table, task))
+            yield table
+    finally:
+        # When the consumer stops early (e.g. a failed uniqueness check closes this generator),
+        # drop the releases that have not started instead of flattening the rest of the corpus.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def build_full(tasks, workers=1):
+    """Flatten every release task, yielding one Arrow table per release in task order."""
+    return build_release_tables(tasks, workers)
+
+def build_incremental(tasks, categories_dir, cache_dir, workers=1):
+    """
+    Flatten only the releases whose JSON content changed since the last build.
+
+    A manifest in cache_dir records, for every release file, its content hash, row count
+    and the per-release Parquet fragment holding its flattened records (named after that hash).
+    Releases whose hash matches the manifest reuse their cached fragment; changed or new
+    releases are re-flattened (in parallel when workers > 1) into a new fragment. Fragments
+    that are no longer referenced are removed. Yields one Arrow table per release in task order; the
+    manifest is saved once every table has been consumed.
+    """
+    fragments_dir = cache_dir / "fragments"
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    old_entries = manifest["releases"]
+    new_entries = {}
+    plan = []  # (task, manifest entry, whether the cached fragment can be reused)
+
+    for task in tasks:
+        json_file = task[3]
+        rel_path = json_file.relative_to(categories_dir).as_posix()
+        content_hash = file_hash(json_file)
+        # Fragments are named after the content they were built from, so a fragment written
+        # by an aborted build can never be mistaken for the one matching an older manifest hash.
+        fragment = Path(rel_path).with_suffix(f".{content_hash[:16]}.parquet").as_posix()
+        entry = old_entries.get(rel_path)
+        cached = bool(entry and entry["hash"] == content_hash and (fragments_dir / fragment).is_file())
+        if not cached:
+            entry = {"path": rel_path, "hash": content_hash, "rows": 0, "fragment": fragment}
+        new_entries[rel_path] = entry
+        plan.append((task, entry, cached))
+
+    stale = [task for task, _, cached in plan if not cached]
+    rebuilt = build_release_tables(stale, workers)
+    try:
+        for task, entry, cached in plan:
+            fragment_path = fragments_dir / entry["fragment"]
+            if cached:
+                yield pq.read_table(fragment_path, schema=RECORD_SCHEMA)
+                continue
+            table = next(rebuilt)
+            fragment_path.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, fragment_path)
+            entry["rows"] = table.num_rows
+            yield table
+    finally:
+        rebuilt.close()
+
+    # Drop fragments no longer referenced: releases that were deleted, renamed or changed
+    # since the last build, and fragments left behind by aborted builds.
+    referenced = {entry["fragment"] for entry in new_entries.values()}
+    for fragment_path in fragments_dir.rglob("*.parquet"):
+        if fragment_path.relative_to(fragments_dir).as_posix() not in referenced:
+            fragment_path.unlink()
+
+    manifest["releases"] = new_entries
+    save_manifest(cache_dir, manifest)
+    print(f"Incremental build: {len(stale)} of {len(new_entries)} releases re-flattened")
+
+class UniqueIdChecker:
+    """
+    Streaming integrity checks over the base records (no parallel, not a variation) of
+    each release as it is produced:
+      - a set_unique_id must always name the same set, and
+      - a card_unique_id must belong to a single card name.
+    Distinct (id, name) pairs are computed per release with Arrow group_by kernels and then
+    checked against hash maps of everything seen so far, so a bad release fails the build
+    as soon as it is flattened, naming the offending file.
+    """
+
+    def __init__(self):
+        self._sets = {}   # set_unique_id -> (set name, file)
+        self._cards = {}  # card_unique_id -> (card name, file)
+
+    @staticmethod
+    def _distinct_pairs(table, id_column, name_column):
+        pairs = pa.table({
+            id_column: table[id_column].cast(pa.string()),
+            name_column: table[name_column].cast(pa.string()),
+        })
+        return pairs.group_by([id_column, name_column]).aggregate([])
+
+    def check(self, table, source):
+        """Check the base records of one release table, raising ValueError on a duplicate ID."""
+        is_base = pc.and_(pc.equal(table["parallel"], ""), pc.invert(table["_is_variation"]))
+        base = table.filter(is_base)
+
+        set_pairs = self._distinct_pairs(base, "set_unique_id", "set")
+        dup_ids = []
+        for set_id, set_name in zip(set_pairs["set_unique_id"].to_pylist(), set_pairs["set"].to_pylist()):
+            seen = self._sets.setdefault(set_id, (set_name, source))
+            if seen[0] != set_name:
+                dup_ids.append(f"{set_id} ('{seen[0]}' in {seen[1]}, '{set_name}' in {source})")
+        if dup_ids:
+            raise ValueError(f"Duplicate set_unique_id found for multiple sets in {source}: {dup_ids}")
+
+        card_pairs = self._distinct_pairs(base, "card_unique_id", "card_name")
+        counts = pc.value_counts(card_pairs["card_unique_id"])
+        repeated = counts.filter(pc.greater(counts.field("counts"), 1)).field("values").to_pylist()
+        if repeated:
+            raise ValueError(f"Duplicate card_unique_id found in base records of {source}: {repeated}")
+        for card_id, card_name in zip(card_pairs["card_unique_id"].to_pylist(), card_pairs["card_name"].to_pylist()):
+            seen = self._cards.setdefault(card_id, (card_name, source))
+            if seen[0] != card_name:
+                dup_ids.append(f"{card_id} ('{seen[0]}' in {seen[1]}, '{card_name}' in {source})")
+        if dup_ids:
+            raise ValueError(f"Duplicate card_unique_id found in base records of {source}: {dup_ids}")
+
+class StatsBuilder:
+    """
+    Collects per-release record counts as the release tables stream past, for the small
+    output/stats.json artifact read by the badge and graph scripts instead of the dataset.
+    Counting is a few Arrow kernels per table, so with --incremental the stats of unchanged
+    releases come from their cached fragments at no extra cost.
+    """
+
+    def __init__(self):
+        self.releases = []  # (category, year, release, cards, variations, parallels)
+
+    def add(self, task, table):
+        category, year, release, _ = task
+        is_card = pc.equal(table["card_parent_unique_id"], "")
+        is_variation = pc.and_(table["_is_variation"], pc.equal(table["parallel"], ""))
+        cards = pc.sum(is_card).as_py() or 0
+        variations = pc.sum(is_variation).as_py() or 0
+        self.releases.append((category, year, release, cards, variations, table.num_rows - cards - variations))
+
+    def to_dict(self, categories_dir):
+        """
+        Return the stats: record counts per category, year and release, plus the share of
+        indexed releases per year taken from the categories/<category>.json index files.
+        """
+        stats = {"version": STATS_VERSION, "categories": {}}
+        empty = {"cards": 0, "variations": 0, "parallels": 0}
+        for category, year, release, cards, variations, parallels in self.releases:
+            category_stats = stats["categories"].setdefault(category, dict(empty, releases=0, years={}, indexed={}))
+            year_stats = category_stats["years"].setdefault(year, dict(empty, releases={}))
+            year_stats["releases"][release] = {"cards": cards, "variations": variations, "parallels": parallels}
+            category_stats["releases"] += 1
+            for counts in (category_stats, year_stats):
+                counts["cards"] += cards
+                counts["variations"] += variations
+                counts["parallels"] += parallels
+
+        for category_file in sorted(categories_dir.glob("*.json")):
+            years = json_codec.load_path(category_file).get("category", {}).get("years", [])
+            category_stats = stats["categories"].setdefault(
+                category_file.stem, dict(empty, releases=0, years={}, indexed={}))
+            for entry in years:
+                releases = entry.get("releases", [])
+                indexed = sum(1 for release in releases if release.get("indexed", False))
+                category_stats["indexed"][entry.get("year", "")] = {
+                    "releases": len(releases), "indexed": indexed,
+                    "percent": indexed / len(releases) * 100 if releases else 0.0,
+                }
+        return stats
+
+def write_if_changed(path, text):
+    """Atomically write text to path unless it already holds exactly that; return True if written."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+    return True
+
+class RowGroupWriter:
+    """
+    Streams tables into one Parquet file in row groups of row_group_size rows, with
+    dictionary encoding for every column and statistics for STATISTICS_COLUMNS.
+
+    Small release tables are buffered until a full row group is available, so the file
+    gets evenly sized row groups (each with its own min/max statistics) while at most one
+    row group worth of rows is held in memory.
+    """
+
+    def __init__(self, path, schema, row_group_size):
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self._buffer = []
+        self._buffered_rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(
+            path, schema,
+            use_dictionary=True,
+            write_statistics=[name for name in STATISTICS_COLUMNS if name in schema.names],
+        )
+
+    def write(self, table):
+        """Buffer a table conforming to RECORD_SCHEMA, writing every completed row group."""
+        self._buffer.append(table.select(self.schema.names).cast(self.schema))
+        self._buffered_rows += table.num_rows
+        if self._buffered_rows >= self.row_group_size:
+            pending = pa.concat_tables(self._buffer)
+            full_rows = (pending.num_rows // self.row_group_size) * self.row_group_size
+            self._writer.write_table(pending.slice(0, full_rows), row_group_size=self.row_group_size)
+            remainder = pending.slice(full_rows)
+            self._buffer = [remainder] if remainder.num_rows else []
+            self._buffered_rows = remainder.num_rows
+
+    def close(self):
+        """Write the last, partial row group and close the file."""
+        if self._buffered_rows:
+            self._writer.write_table(pa.concat_tables(self._buffer), row_group_size=self.row_group_size)
+        self._buffer = []
+        self._buffered_rows = 0
+        self._writer.close()
+
+def write_single_file(tables, path, row_group_size):
+    """Stream release tables into a single Parquet file."""
+    writer = RowGroupWriter(path, OUTPUT_SCHEMA, row_group_size)
+    try:
+        for table in tables:
+            writer.write(table)
+    finally:
+        writer.close()
+
+def write_partitioned(tables, dataset_dir, row_group_size):
+    """
+    Stream release tables into a Hive-partitioned dataset laid out as
+    <dataset_dir>/category=<category>/year=<year>/part-0.parquet.
+
+    The tables must arrive grouped by (category, year); each partition's file is closed
+    as soon as the next partition starts. As usual for Hive datasets, the partition
+    columns are encoded in the directory names rather than stored in the files.
+    """
+    writer = None
+    partition = None
+    try:
+        for table in tables:
+            key = (table["category"][0].as_py(), table["year"][0].as_py())
+            if key != partition:
+                if writer is not None:
+                    writer.close()
+                partition = key
+                path = dataset_dir / f"category={key[0]}" / f"year={key[1]}" / "part-0.parquet"
+                writer = RowGroupWriter(path, PARTITIONED_SCHEMA, row_group_size)
+            writer.write(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+# Normalized SQLite schema for --sqlite. Every table is keyed by the existing uniqueIds;
+# unique and lookup indexes are only created once the bulk load is done (SQLITE_INDEXES).
+SQLITE_TABLES = """
+CREATE TABLE releases (
+    unique_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    year TEXT NOT NULL,
+    release TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE sets (
+    unique_id TEXT NOT NULL,
+    release_unique_id TEXT NOT NULL REFERENCES releases (unique_id),
+    name TEXT NOT NULL
+);
+CREATE TABLE cards (
+    unique_id TEXT NOT NULL,
+    set_unique_id TEXT NOT NULL REFERENCES sets (unique_id),
+    number TEXT,
+    name TEXT NOT NULL,
+    note TEXT,
+    numbered_to INTEGER,
+    insert_odds TEXT
+);
+CREATE TABLE variations (
+    unique_id TEXT NOT NULL,
+    card_unique_id TEXT NOT NULL REFERENCES cards (unique_id),
+    name TEXT NOT NULL,
+    note TEXT,
+    numbered_to INTEGER,
+    insert_odds TEXT
+);
+CREATE TABLE parallels (
+    unique_id TEXT NOT NULL,
+    card_unique_id TEXT NOT NULL REFERENCES cards (unique_id),
+    variation_unique_id TEXT REFERENCES variations (unique_id),
+    name TEXT NOT NULL,
+    numbered_to INTEGER,
+    insert_odds TEXT
+);
+CREATE TABLE card_attributes (
+    card_unique_id TEXT NOT NULL REFERENCES cards (unique_id),
+    attribute TEXT NOT NULL
+);
+CREATE TABLE variation_attributes (
+    variation_unique_id TEXT NOT NULL REFERENCES variations (unique_id),
+    attribute TEXT NOT NULL
+);
+"""
+SQLITE_INDEXES = """
+CREATE UNIQUE INDEX releases_unique_id ON releases (unique_id);
+CREATE INDEX releases_category_year ON releases (category, year);
+CREATE UNIQUE INDEX sets_unique_id ON sets (unique_id);
+CREATE INDEX sets_release_unique_id ON sets (release_unique_id);
+CREATE UNIQUE INDEX cards_unique_id ON cards (unique_id);
+CREATE INDEX cards_set_unique_id_number ON cards (set_unique_id, number);
+CREATE INDEX cards_name ON cards (name);
+CREATE UNIQUE INDEX variations_unique_id ON variations (unique_id);
+CREATE INDEX variations_card_unique_id ON variations (card_unique_id);
+CREATE UNIQUE INDEX parallels_unique_id ON parallels (unique_id);
+CREATE INDEX parallels_card_unique_id ON parallels (card_unique_id);
+CREATE INDEX parallels_variation_unique_id ON parallels (variation_unique_id);
+CREATE INDEX card_attributes_card_unique_id ON card_attributes (card_unique_id);
+CREATE INDEX card_attributes_attribute ON card_attributes (attribute);
+CREATE INDEX variation_attributes_variation_unique_id ON variation_attributes (variation_unique_id);
+CREATE INDEX variation_attributes_attribute ON variation_attributes (attribute);
+"""
+
+class SqliteWriter:
+    """
+    Loads release tables into a normalized SQLite database (SQLITE_TABLES).
+
+    The flattened rows are split back into releases, sets, base cards, variations and
+    parallels, and each release is inserted with one executemany per table inside a single
+    transaction. The file is new and only kept once complete, so the load runs without a
+    journal or fsyncs, and the indexes are created after the last release.
+    """
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode = OFF")
+        self._connection.execute("PRAGMA synchronous = OFF")
+        self._connection.executescript(SQLITE_TABLES)
+        self._connection.execute("BEGIN")
+
+    @staticmethod
+    def _values(column):
+        """
+        Return a column as a Python list. Dictionary columns are decoded through their
+        dictionary, which is far faster than converting every row's value on its own.
+        """
+        column = column.combine_chunks()
+        if pa.types.is_dictionary(column.type):
+            values = column.dictionary.to_pylist()
+            return [None if index is None else values[index] for index in column.indices.to_pylist()]
+        return column.to_pylist()
+
+    @staticmethod
+    def _list_slices(column):
+        """
+        Return a list column as (offsets, values): row i holds values[offsets[i]:offsets[i + 1]].
+        Converting the flat values once is much cheaper than converting one Python list per row.
+        """
+        column = column.combine_chunks()
+        offsets = column.offsets.to_pylist()
+        start = offsets[0]
+        return [offset - start for offset in offsets], column.flatten()
+
+    def write(self, table):
+        """Insert the rows of one release table conforming to RECORD_SCHEMA."""
+        columns = {name: self._values(table.column(name)) for name in (
+            "set_unique_id", "set", "card_unique_id", "card_parent_unique_id", "card_number", "card_name",
+            "note", "parallel", "numberedTo", "_is_variation")}
+
+        attribute_offsets, attribute_values = self._list_slices(table.column("attributes"))
+        attribute_values = attribute_values.to_pylist()
+        columns["attributes"] = [attribute_values[start:end]
+                                 for start, end in zip(attribute_offsets, attribute_offsets[1:])]
+
+        # insertOdds are stored as JSON text. Most odds repeat across the parallels of a set,
+        # so each distinct list is encoded once.
+        odds_offsets, odds_values = self._list_slices(table.column("insertOdds"))
+        odds_pairs = list(zip(odds_values.field("product").to_pylist(), odds_values.field("odds").to_pylist()))
+        odds_valid = table.column("insertOdds").is_valid().to_pylist()
+        encoded_odds = {}
+        columns["insertOdds"] = []
+        for valid, start, end in zip(odds_valid, odds_offsets, odds_offsets[1:]):
+            if not valid:
+                columns["insertOdds"].append(None)
+                continue
+            pairs = tuple(odds_pairs[start:end])
+            encoded = encoded_odds.get(pairs)
+            if encoded is None:
+                encoded = encoded_odds[pairs] = json_codec.dumps([{"product": product, "odds": odds}
+                                                            for product, odds in pairs])
+            columns["insertOdds"].append(encoded)
+
+        first = table.slice(0, 1).to_pylist()[0]
+        releases = [(first["release_unique_id"], first["category"], first["year"], first["release"],
+                     first["release_name"])]
+        sets, cards, variations, parallels, card_attributes, variation_attributes = [], [], [], [], [], []
+        seen_sets = set()
+        card_of_variation = {}
+        for (set_unique_id, set_name, unique_id, parent_id, number, name, note, parallel, numbered_to,
+             is_variation, attributes, insert_odds) in zip(*columns.values()):
+            if set_unique_id not in seen_sets:
+                seen_sets.add(set_unique_id)
+                sets.append((set_unique_id, releases[0][0], set_name))
+            if not parent_id:
+                cards.append((unique_id, set_unique_id, number, name, note or None, numbered_to,
+                              insert_odds))
+                card_attributes.extend((unique_id, attribute) for attribute in attributes)
+            elif is_variation and parent_id not in card_of_variation:
+                # A variation row; its parallels are the rows whose parent is the variation.
+                card_of_variation[unique_id] = parent_id
+                variations.append((unique_id, parent_id, name, note or None, numbered_to,
+                                   insert_odds))
+                variation_attributes.extend((unique_id, attribute) for attribute in attributes)
+            else:
+                variation_id = parent_id if parent_id in card_of_variation else None
+                card_id = card_of_variation[parent_id] if variation_id else parent_id
+                parallels.append((unique_id, card_id, variation_id, parallel, numbered_to,
+                                  insert_odds))
+
+        execute = self._connection.executemany
+        execute("INSERT INTO releases VALUES (?, ?, ?, ?, ?)", releases)
+        execute("INSERT INTO sets VALUES (?, ?, ?)", sets)
+        execute("INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?)", cards)
+        execute("INSERT INTO variations VALUES (?, ?, ?, ?, ?, ?)", variations)
+        execute("INSERT INTO parallels VALUES (?, ?, ?, ?, ?, ?)", parallels)
+        execute("INSERT INTO card_attributes VALUES (?, ?)", card_attributes)
+        execute("INSERT INTO variation_attributes VALUES (?, ?)", variation_attributes)
+
+    def close(self):
+        """Create the indexes, commit the load and close the database."""
+        self._connection.execute("COMMIT")
+        self._connection.executescript(SQLITE_INDEXES)
+        self._connection.execute("ANALYZE")
+        self._connection.close()
+
+    def abort(self):
+        """Close the database without creating its indexes (the caller discards the file)."""
+        self._connection.close()
+
+def discard_output(path):
+    """Remove a partially written dataset file or directory."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Flatten every release JSON file under categories/ into output/dataset.parquet."
+    )
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse cached per-release Parquet fragments for releases whose JSON is unchanged")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="Directory holding the incremental manifest and fragments (default: output/.cache)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to flatten releases (0 = one per CPU, default: 1)")
+    parser.add_argument("--partitioned", action="store_true",
+                        help="Write a Hive-partitioned dataset (output/dataset/category=*/year=*) instead of a single file")
+    parser.add_argument("--name-index", action="store_true",
+                        help="Also write the player name search index to <output-dir>/name-index")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="Also write a normalized SQLite database of the dataset to <output-dir>/dataset.sqlite")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help=f"Rows per Parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})")
     # Since this script is in the 'scripts' folder, the repository root is one level up.
     base_dir = Path(__file__).parent.parent
-    categories_dir = base_dir / "categories"
-    all_records = []
+    parser.add_argument("--categories-dir", type=Path, default=base_dir / "categories",
+                        help="Directory holding the <category>/<year>/*.json release files (default: categories/)")
+    parser.add_argument("--output-dir", type=Path, default=base_dir / "output",
+                        help="Directory the dataset is written to (default: output/)")
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    categories_dir = args.categories_dir
+    output_dir = args.output_dir
+
+    # Order the releases the way they are written, so the tables can be streamed straight
+    # to disk: by year and release for the single file, by partition then release otherwise.
+    # The sort is stable, so ties keep the category order of iter_release_files.
+    tasks = list(iter_release_files(categories_dir))
+    if args.partitioned:
+        tasks.sort(key=lambda task: (task[0], task[1], task[2]))
+    else:
+        tasks.sort(key=lambda task: (task[1], task[2]))
 
     # Process JSON files and flatten records.
-    for category_dir in categories_dir.iterdir():
-        if category_dir.is_dir():
-            for year_dir in category_dir.iterdir():
-                if year_dir.is_dir():
-                    for json_file in year_dir.glob("*.json"):
-                        parts = json_file.stem.split("-", 1)
-                        release = parts[1] if len(parts) == 2 else parts[0]
-                        try:
-                            with json_file.open("r", encoding="utf-8") as f:
-                                data = json.load(f)
-                            records = flatten_card_data(category_dir.name, year_dir.name, release, data)
-                            all_records.extend(records)
-                        except Exception as e:
-                            print(f"Error processing {json_file}: {e}")
-                            sys.exit(1)
-
-    if not all_records:
+    if args.incremental:
+        cache_dir = args.cache_dir or output_dir / CACHE_DIRNAME
+        tables = build_incremental(tasks, categories_dir, cache_dir, workers)
+    else:
+        tables = build_full(tasks, workers)
+
+    # Check every release for duplicate IDs as soon as it is produced, skipping empty releases.
+    checker = UniqueIdChecker()
+    record_count = 0
+    name_index = NameIndexBuilder() if args.name_index else None
+    stats = StatsBuilder()
+
+    def checked(tables):
+        nonlocal record_count
+        # Iterate the tables (not the tasks) to exhaustion, so generators such as
+        # build_incremental get to run their cleanup after the last table.
+        sources = iter(tasks)
+        for table in tables:
+            task = next(sources)
+            if table.num_rows:
+                checker.check(table, task[3])
+                record_count += table.num_rows
+                stats.add(task, table)
+                if name_index is not None:
+                    name_index.add(table)
+                if sqlite_writer is not None:
+                    sqlite_writer.write(table)
+                yield table
+
+    # Write to a temporary location first, so a failed build never replaces the previous dataset.
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if args.partitioned:
+        final_path = output_dir / "dataset"
+        tmp_path = output_dir / "dataset.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        write = write_partitioned
+    else:
+        final_path = output_dir / "dataset.parquet"
+        tmp_path = output_dir / "dataset.parquet.tmp"
+        write = write_single_file
+
+    sqlite_path = output_dir / "dataset.sqlite"
+    sqlite_tmp_path = output_dir / "dataset.sqlite.tmp"
+    sqlite_writer = SqliteWriter(sqlite_tmp_path) if args.sqlite else None
+
+    def discard_outputs():
+        discard_output(tmp_path)
+        if sqlite_writer is not None:
+            sqlite_writer.abort()
+            discard_output(sqlite_tmp_path)
+
+    try:
+        write(checked(tables), tmp_path, args.row_group_size)
+    except (RuntimeError, ValueError) as e:
+        print(e)
+        # Stop flattening right away, cancelling any releases still queued in the pool.
+        tables.close()
+        discard_outputs()
+        sys.exit(1)
+
+    if not record_count:
         print("No records found to process.")
+        discard_outputs()
         sys.exit(1)
 
-    # Create a DataFrame.
-    df = pd.DataFrame(all_records)
-
-    # Filter to base records: those with no parallel and not marked as a variation.
-    df_base = df[(df["parallel"] == "") & (~df["_is_variation"])]
-
-    # For set_unique_id, drop duplicate rows (since the same set appears on multiple cards)
-    # then group by set_unique_id and check if a single set name is associated with each.
-    df_sets = df_base[['set_unique_id', 'set']].drop_duplicates()
-    dup_sets = df_sets.groupby('set_unique_id')['set'].nunique()
-    if (dup_sets > 1).any():
-        dup_ids = dup_sets[dup_sets > 1].index.tolist()
-        raise ValueError(f"Duplicate set_unique_id found for multiple sets: {dup_ids}")
-
-    # For card_unique_id, drop duplicate rows (if any) and then check for duplicates.
-    df_cards = df_base[['card_unique_id', 'card_name']].drop_duplicates()
-    if df_cards['card_unique_id'].duplicated().any():
-        dup_ids = df_cards[df_cards['card_unique_id'].duplicated(keep=False)]['card_unique_id'].unique()
-        raise ValueError(f"Duplicate card_unique_id found in base records: {dup_ids}")
-
-    # Remove the temporary field '_is_variation' from all records.
-    df = df.drop(columns=["_is_variation"])
-
-    # Sort the DataFrame by year and release (ascending).
-    df = df.sort_values(by=["year", "release"], ascending=True)
-
-    # Write to a Parquet file.
-    output_dir = base_dir / "output"
-    output_dir.mkdir(exist_ok=True)
-    parquet_path = output_dir / "dataset.parquet"
-    df.to_parquet(parquet_path, index=False)
-    print(f"Dataset written to {parquet_path}")
+    if final_path.is_dir():
+        shutil.rmtree(final_path)
+    os.replace(tmp_path, final_path)
+    print(f"Dataset written to {final_path}")
+
+    stats_path = output_dir / "stats.json"
+    stats_text = json_codec.dumps(stats.to_dict(categories_dir), separators=(",", ":"), sort_keys=True) + "\n"
+    if write_if_changed(stats_path, stats_text):
+        print(f"Statistics written to {stats_path}")
+    else:
+        print(f"Statistics in {stats_path} are unchanged")
+
+    if sqlite_writer is not None:
+        sqlite_writer.close()
+        os.replace(sqlite_tmp_path, sqlite_path)
+        print(f"SQLite database written to {sqlite_path}")
+
+    if name_index is not None:
+        name_index.write(output_dir / "name-index")
+        print(f"Name index written to {output_dir / 'name-index'}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,213 @@
+"""
+In-process lookups over the flattened card records written by build-parquet.py.
+
+    from card_query import CardIndex
+
+    index = CardIndex.from_parquet("output/dataset.parquet")
+    index.card("066dbffc-9110-4993-8487-393d44c67af6")
+    index.cards_by_number("b697d3da-7a1e-4340-96ea-35daf34983cd", "156")
+    index.search_player("Griffey")
+
+Every index maps a key to row positions in the records, so a lookup is a dictionary access
+and only the matching rows are turned into Python dicts.
+"""
+from collections import defaultdict
+from pathlib import Path
+import re
+import unicodedata
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_DATASET = Path(__file__).parent.parent / "output" / "dataset.parquet"
+
+# Columns with few distinct values are read dictionary-encoded, as they are built.
+DICTIONARY_COLUMNS = ["category", "release_unique_id", "year", "release", "release_name",
+                      "set_unique_id", "set", "parallel"]
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+def name_tokens(name):
+    """
+    Split a player name into lower-case, accent-free word tokens, so "Ronald Acuña Jr."
+    and "ronald acuna jr" produce the same tokens.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return TOKEN_PATTERN.findall(folded)
+
+class RowIndex:
+    """
+    Maps keys to row positions. The positions of every key live in one flat int64 array and
+    each key maps to its (start, stop) span in it, which keeps large indexes compact.
+    """
+
+    def __init__(self, spans, positions):
+        self.spans = spans
+        self.positions = positions
+
+    @classmethod
+    def from_lists(cls, rows_by_key):
+        """Build the index from a dict of key -> sorted array of row positions."""
+        spans = {}
+        start = 0
+        for key, rows in rows_by_key.items():
+            spans[key] = (start, start + len(rows))
+            start += len(rows)
+        positions = np.concatenate(list(rows_by_key.values())) if rows_by_key else np.empty(0, np.int64)
+        return cls(spans, positions)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, key):
+        return key in self.spans
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def array(self, key):
+        """Return the row positions of key as a numpy array view (empty when key is unknown)."""
+        start, stop = self.spans.get(key, (0, 0))
+        return self.positions[start:stop]
+
+    def get(self, key):
+        return self.array(key).tolist()
+
+def group_rows(table, keys):
+    """
+    Return a RowIndex mapping each distinct value of the key columns (a tuple when there are
+    several) to the row positions holding it, in table order. The grouping runs in Arrow.
+    """
+    rows = pa.array(range(table.num_rows), pa.int64())
+    groups = (pa.table({**{key: table.column(key) for key in keys}, "_row": rows})
+              .group_by(keys, use_threads=False)
+              .aggregate([("_row", "list")]))
+    values = [groups.column(key).to_pylist() for key in keys]
+    group_keys = values[0] if len(keys) == 1 else zip(*values)
+    row_lists = groups.column("_row_list").combine_chunks()
+    offsets = row_lists.offsets.to_pylist()
+    spans = dict(zip(group_keys, zip(offsets[:-1], offsets[1:])))
+    return RowIndex(spans, row_lists.flatten().to_numpy())
+
+def column_values(column):
+    """
+    Return a column of scalars as a Python list. String columns are decoded through a
+    dictionary, so a value repeated on many rows (a set name, a player) is one string object.
+    """
+    if pa.types.is_string(column.type):
+        column = column.dictionary_encode()
+    if pa.types.is_dictionary(column.type):
+        values = column.dictionary.to_pylist()
+        return [None if index is None else values[index] for index in column.indices.to_pylist()]
+    return column.to_pylist()
+
+class CardIndex:
+    """
+    Hash indexes over a table of flattened card records:
+
+      - release uniqueId  -> rows of the release
+      - set uniqueId      -> rows of the set
+      - card uniqueId     -> row of the card (base, parallel or variation)
+      - (release uniqueId, card number) -> rows with that number in the release
+      - player name token -> rows whose card name contains the token
+
+    Scalar columns are kept as Python lists, so building a record is a list access per column;
+    list columns (attributes, insertOdds) stay in Arrow and are converted per record.
+    """
+
+    def __init__(self, table):
+        self.table = table.combine_chunks()
+        self.columns = []
+        for name in self.table.column_names:
+            column = self.table.column(name).combine_chunks()
+            if pa.types.is_nested(column.type):
+                self.columns.append((name, False, column))
+            else:
+                self.columns.append((name, True, column_values(column)))
+
+        self.rows_by_release = group_rows(self.table, ["release_unique_id"])
+        self.rows_by_set = group_rows(self.table, ["set_unique_id"])
+        self.rows_by_number = group_rows(self.table, ["release_unique_id", "card_number"])
+        card_ids = next(values for name, _, values in self.columns if name == "card_unique_id")
+        # uniqueIds are unique in a built dataset; should one repeat, its first row wins.
+        self.row_by_card = dict(zip(reversed(card_ids), range(len(card_ids) - 1, -1, -1)))
+
+        # Names repeat on every parallel row, so each distinct name is tokenized once and
+        # its rows are merged into the posting list of every token it contains.
+        rows_by_name = group_rows(self.table, ["card_name"])
+        name_rows_by_token = defaultdict(list)
+        for name in rows_by_name:
+            for token in set(name_tokens(name or "")):
+                name_rows_by_token[token].append(rows_by_name.array(name))
+        self.rows_by_token = RowIndex.from_lists({
+            token: np.sort(np.concatenate(arrays)) for token, arrays in name_rows_by_token.items()
+        })
+
+    @classmethod
+    def from_parquet(cls, path=DEFAULT_DATASET):
+        """Load the single-file dataset (output/dataset.parquet by default) and index it."""
+        table = pq.read_table(path, read_dictionary=DICTIONARY_COLUMNS)
+        return cls(table)
+
+    @classmethod
+    def from_tables(cls, tables):
+        """Index the tables returned by flatten_card_data, without writing them to disk first."""
+        return cls(pa.concat_tables(tables))
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def record(self, row):
+        return {name: values[row] if is_scalar else values[row].as_py()
+                for name, is_scalar, values in self.columns}
+
+    def records(self, rows):
+        """Return the records at the given row positions as dicts, in the order given."""
+        return [self.record(row) for row in rows]
+
+    def take(self, rows):
+        """Return the records at the given row positions as an Arrow table."""
+        return self.table.take(pa.array(rows, pa.int64()))
+
+    def card(self, card_unique_id):
+        """Return the record of one card (base, parallel or variation), or None."""
+        row = self.row_by_card.get(card_unique_id)
+        return None if row is None else self.record(row)
+
+    def release_rows(self, release_unique_id):
+        return self.rows_by_release.get(release_unique_id)
+
+    def set_rows(self, set_unique_id):
+        return self.rows_by_set.get(set_unique_id)
+
+    def number_rows(self, release_unique_id, card_number):
+        return self.rows_by_number.get((release_unique_id, card_number))
+
+    def release(self, release_unique_id):
+        return self.records(self.release_rows(release_unique_id))
+
+    def set(self, set_unique_id):
+        return self.records(self.set_rows(set_unique_id))
+
+    def cards_by_number(self, release_unique_id, card_number):
+        """Return every record with the given card number in a release, parallels included."""
+        return self.records(self.number_rows(release_unique_id, card_number))
+
+    def player_rows(self, name):
+        """
+        Return the row positions whose card name contains every word token of name, in table order.
+        """
+        tokens = set(name_tokens(name))
+        if not tokens or any(token not in self.rows_by_token for token in tokens):
+            return []
+        postings = sorted((self.rows_by_token.array(token) for token in tokens), key=len)
+        matches = postings[0]
+        for rows in postings[1:]:
+            matches = np.intersect1d(matches, rows, assume_unique=True)
+        return matches.tolist()
+
+    def search_player(self, name, limit=None):
+        """Return the records whose card name contains every word of name (case and accents ignored)."""
+        rows = self.player_rows(name)
+        return self.records(rows if limit is None else rows[:limit])
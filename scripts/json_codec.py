@@ -0,0 +1,78 @@
+"""
+JSON encoding and decoding for the scripts, using orjson when it is installed and the
+standard library json module otherwise.
+
+    from json_codec import load_path, dumps
+
+    data = load_path("categories/baseball/2025/2025-Topps.json")
+    text = dumps(data, indent=2)
+
+The functions take the same arguments as their json counterparts and always return what
+json would: orjson is only used for the output formats it writes byte for byte the same
+(compact, or indent=2, with non-ASCII characters escaped only when asked to), so switching
+between the two never changes the files the scripts write. Other formats, such as the
+repository's 4-space indentation, are encoded by json. JSONDecodeError is raised by both
+decoders, and is json.JSONDecodeError (orjson's error derives from it).
+
+The one difference left is in floats: orjson writes magnitudes below 1e-4 or from 1e16 up
+differently ("0.00001" and "1e16" against json's "1e-05" and "1e+16"), and NaN/infinities
+as null. The documents of this repository hold integers and percentages only, so nothing
+they write is affected; checking the output for such floats would cost more than json.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+COMPACT_SEPARATORS = (",", ":")
+
+def loads(s):
+    """Decode a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+def load(fp):
+    """Decode the JSON document read from a file object."""
+    return loads(fp.read())
+
+def load_path(path):
+    """Decode the JSON file at path."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def _orjson_option(indent, separators, sort_keys):
+    """Return the orjson option writing this format exactly like json, or None if there is none."""
+    if indent is None:
+        if tuple(separators or ()) != COMPACT_SEPARATORS:
+            return None
+        option = 0
+    elif indent in (2, "  ") and (separators is None or tuple(separators) == (",", ": ")):
+        option = orjson.OPT_INDENT_2
+    else:
+        return None
+    return option | orjson.OPT_SORT_KEYS if sort_keys else option
+
+def dumps_bytes(obj, indent=None, ensure_ascii=True, sort_keys=False, separators=None):
+    """Encode obj like json.dumps with the same arguments, returning UTF-8 bytes."""
+    option = None if orjson is None else _orjson_option(indent, separators, sort_keys)
+    if option is not None:
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            data = None  # e.g. non-string keys or integers over 64 bits: leave them to json
+        if data is not None and (not ensure_ascii or data.isascii()):
+            return data
+    return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii, sort_keys=sort_keys,
+                      separators=separators).encode("utf-8")
+
+def dumps(obj, indent=None, ensure_ascii=True, sort_keys=False, separators=None):
+    """Encode obj like json.dumps with the same arguments."""
+    return dumps_bytes(obj, indent, ensure_ascii, sort_keys, separators).decode("utf-8")
+
+def dump(obj, fp, indent=None, ensure_ascii=True, sort_keys=False, separators=None):
+    """Encode obj into a text file object like json.dump."""
+    fp.write(dumps(obj, indent, ensure_ascii, sort_keys, separators))
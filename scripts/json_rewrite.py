@@ -0,0 +1,110 @@
+"""
+Shared write path for the maintenance scripts that edit JSON files in place
+(add-uid.py, add-category-uid.py, propagate-release-uniqueId.py and attribute-cleanup.py).
+
+    data, original = load_json(path)
+    ... modify data ...
+    changed = write_json(path, data, original)
+
+write_json serializes the document to a string in the file's own style (indentation, ASCII
+escaping and trailing newline are taken from the original text) and compares it with what is
+on disk. Unchanged files are never touched. Changed files are written to a temporary file in
+the same directory and renamed over the original, so an interrupted run can never leave a
+half-written file behind. Encoding and decoding go through json_codec. map_files runs a
+per-file function in a process pool.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import json_codec
+
+DEFAULT_INDENT = 4
+
+def detect_indentation(content):
+    """Detect indentation in the text of a JSON file."""
+    # Find the first indented line
+    lines = content.split('\n')
+    for line in lines:
+        if line.startswith(' ') or line.startswith('\t'):
+            # Count leading spaces or tabs
+            indent = ''
+            for char in line:
+                if char in (' ', '\t'):
+                    indent += char
+                else:
+                    break
+            return indent
+
+    # Default to 2 spaces if no indentation detected
+    return '  '
+
+def load_json(path):
+    """Return (data, original text) of a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        original = f.read()
+    return json_codec.loads(original), original
+
+def dumps_like(data, original=None, indent=None):
+    """
+    Serialize data the way original is formatted: same indentation (unless indent is given),
+    non-ASCII characters escaped only if original has none unescaped, and a trailing newline
+    only if original ends with one. Without an original, DEFAULT_INDENT and ASCII are used.
+    """
+    if indent is None:
+        indent = detect_indentation(original) if original else DEFAULT_INDENT
+    ensure_ascii = original is None or original.isascii()
+    text = json_codec.dumps(data, indent=indent, ensure_ascii=ensure_ascii)
+    if original and original.endswith('\n'):
+        text += '\n'
+    return text
+
+def atomic_write(path, text):
+    """Write text to path through a temporary file in the same directory and a rename."""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def write_json(path, data, original=None, indent=None):
+    """
+    Write data to the JSON file at path if that changes its content; return True if written.
+    original is the current text of the file when the caller already read it (it is read
+    here otherwise); formatting follows dumps_like.
+    """
+    if original is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                original = f.read()
+        except FileNotFoundError:
+            pass
+    text = dumps_like(data, original, indent)
+    if text == original:
+        return False
+    atomic_write(path, text)
+    return True
+
+def map_files(function, items, workers):
+    """
+    Yield function(item) for every item, in order. With workers > 1 the calls run in a pool
+    of that many processes, so function must be a module-level function.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield function(item)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, items, chunksize=max(1, len(items) // (4 * workers)))
@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import quote
+import json_codec
+
+async def request(reader, writer, target, etag=None):
+    """Send one keep-alive GET and return (status, headers, body)."""
+    extra = f"If-None-Match: {etag}\r\n" if etag else ""
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n{extra}\r\n".encode("latin-1"))
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    body = await reader.readexactly(length) if length else b""
+    return status, headers, body
+
+async def fetch_json(host, port, target):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, _, body = await request(reader, writer, target)
+    finally:
+        writer.close()
+    if status != 200:
+        raise RuntimeError(f"GET {target} returned {status}")
+    return json_codec.loads(body)
+
+async def build_targets(host, port, count, seed):
+    """
+    Pick a realistic mix of request targets from the running server: release, set, card,
+    card-number and search lookups on randomly chosen releases.
+    """
+    rng = random.Random(seed)
+    releases = (await fetch_json(host, port, "/releases?limit=1000"))["items"]
+    targets = ["/releases"]
+    for release in rng.sample(releases, min(len(releases), 20)):
+        release_id = release["release_unique_id"]
+        targets.append(f"/releases/{release_id}")
+        detail = await fetch_json(host, port, f"/releases/{release_id}")
+        for card_set in rng.sample(detail["sets"], min(len(detail["sets"]), 3)):
+            targets.append(f"/sets/{card_set['set_unique_id']}?limit=50")
+            cards = (await fetch_json(host, port, f"/sets/{card_set['set_unique_id']}?limit=20"))["items"]
+            for card in cards[:5]:
+                targets.append(f"/cards/{card['card_unique_id']}")
+                if card["card_number"]:
+                    targets.append(f"/releases/{release_id}/cards/{quote(card['card_number'], safe='')}")
+                surname = (card["card_name"] or "x").split()[-1]
+                targets.append(f"/search?q={quote(surname)}&limit=20")
+    return [rng.choice(targets) for _ in range(count)]
+
+async def client(host, port, targets, deadline, revalidate, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        position = 0
+        while time.perf_counter() < deadline:
+            target = targets[position % len(targets)]
+            position += 1
+            start = time.perf_counter()
+            status, headers, _ = await request(reader, writer, target, etags.get(target) if revalidate else None)
+            results["latencies"].append(time.perf_counter() - start)
+            results["statuses"][status] = results["statuses"].get(status, 0) + 1
+            if "etag" in headers:
+                etags[target] = headers["etag"]
+    finally:
+        writer.close()
+
+async def run(args):
+    targets = await build_targets(args.host, args.port, 10000, args.seed)
+    results = {"latencies": [], "statuses": {}}
+    deadline = time.perf_counter() + args.duration
+    start = time.perf_counter()
+    # Each client walks the same target list from a different starting point.
+    await asyncio.gather(*(
+        client(args.host, args.port, targets[i * 97:] + targets[:i * 97], deadline, args.revalidate, results)
+        for i in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(results["latencies"])
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"{len(latencies)} requests in {elapsed:.2f}s over {args.connections} connections: "
+          f"{len(latencies) / elapsed:.0f} requests/sec")
+    print(f"Latency p50 {percentile(0.5):.2f} ms, p90 {percentile(0.9):.2f} ms, p99 {percentile(0.99):.2f} ms")
+    print("Status codes: " + ", ".join(f"{status}: {count}" for status, count in sorted(results["statuses"].items())))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a running serve-api.py on localhost.")
+    parser.add_argument("--host", default="127.0.0.1", help="Server address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Server port (default: 8000)")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections (default: 32)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run for (default: 10)")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Send If-None-Match with the last ETag seen for each target, as a caching client would")
+    parser.add_argument("--seed", type=int, default=0, help="Seed used to pick the request targets")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Typo-tolerant player name search over the flattened card records.
+
+build-parquet.py --name-index writes the index to output/name-index/ next to the dataset:
+
+    names.parquet     one row per distinct card name, with its word-trigram count
+    trigrams.parquet  each word trigram with the sorted ids of the names containing it
+    cards.parquet     the base and variation cards of every name, ordered by name id
+
+Names are matched on the trigrams of their case- and accent-folded words, so "grifey" still
+finds "Ken Griffey Jr.". Run this file to query the index from the command line:
+
+    python name_search.py "Acuna" --category baseball --attribute RC
+"""
+import argparse
+import math
+import os
+import shutil
+from pathlib import Path
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from card_query import RowIndex, name_tokens
+
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent / "output" / "name-index"
+
+# Columns kept for every indexed card. Parallel rows are left out: they repeat the name,
+# attributes and number of the card they are a parallel of.
+CARD_SCHEMA = pa.schema([
+    ("card_name", pa.string()),
+    ("card_unique_id", pa.string()),
+    ("category", pa.string()),
+    ("year", pa.string()),
+    ("release", pa.string()),
+    ("set", pa.string()),
+    ("card_number", pa.string()),
+    ("attributes", pa.list_(pa.string())),
+])
+
+def word_trigrams(text):
+    """
+    Return the set of trigrams of the folded words of text. Each word is padded with two
+    leading spaces and one trailing space, so word starts weigh more than word ends.
+    """
+    trigrams = set()
+    for token in name_tokens(text):
+        padded = f"  {token} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+class NameIndexBuilder:
+    """Collects the base and variation cards of each flattened release table."""
+
+    def __init__(self):
+        self.tables = []
+
+    def add(self, table):
+        not_parallel = pc.equal(table.column("parallel").cast(pa.string()), "")
+        self.tables.append(table.filter(not_parallel).select(CARD_SCHEMA.names).cast(CARD_SCHEMA))
+
+    def write(self, index_dir):
+        """
+        Write the index files to index_dir, replacing any previous index only once the new
+        one is complete.
+        """
+        cards = pa.concat_tables(self.tables) if self.tables else CARD_SCHEMA.empty_table()
+        names = pc.unique(cards.column("card_name")).drop_null().sort()
+        name_ids = pc.index_in(cards.column("card_name"), value_set=names)
+        # The sort is stable, so the cards of one name keep their build order.
+        cards = cards.append_column("name_id", name_ids).drop_null().sort_by("name_id")
+
+        trigram_counts = []
+        name_ids_by_trigram = {}
+        for name_id, name in enumerate(names.to_pylist()):
+            trigrams = word_trigrams(name)
+            trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                name_ids_by_trigram.setdefault(trigram, []).append(name_id)
+        trigrams = sorted(name_ids_by_trigram)
+
+        tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        pq.write_table(pa.table({"name": names, "trigram_count": pa.array(trigram_counts, pa.int32())}),
+                       tmp_dir / "names.parquet")
+        pq.write_table(pa.table({
+            "trigram": pa.array(trigrams, pa.string()),
+            "name_ids": pa.array([name_ids_by_trigram[trigram] for trigram in trigrams], pa.list_(pa.int32())),
+        }), tmp_dir / "trigrams.parquet")
+        pq.write_table(cards, tmp_dir / "cards.parquet")
+        if index_dir.is_dir():
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+class NameSearchIndex:
+    """
+    Loaded name index. search() ranks names by the share of the query's trigrams they contain
+    (ties broken by how close the whole name is to the query) and returns the matching cards.
+    """
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        index_dir = Path(index_dir)
+        names = pq.read_table(index_dir / "names.parquet")
+        self.names = names.column("name").to_pylist()
+        self.trigram_counts = names.column("trigram_count").to_numpy()
+
+        trigrams = pq.read_table(index_dir / "trigrams.parquet")
+        name_ids = trigrams.column("name_ids").combine_chunks()
+        offsets = name_ids.offsets.to_pylist()
+        self.names_by_trigram = RowIndex(
+            dict(zip(trigrams.column("trigram").to_pylist(), zip(offsets[:-1], offsets[1:]))),
+            name_ids.flatten().to_numpy(),
+        )
+
+        cards = pq.read_table(index_dir / "cards.parquet")
+        self.card_columns = [name for name in CARD_SCHEMA.names if name != "card_name"]
+        self.cards = {name: cards.column(name).to_pylist() for name in self.card_columns}
+        # Cards are ordered by name id, so the cards of name n are card_starts[n]:card_starts[n + 1].
+        self.card_starts = np.searchsorted(cards.column("name_id").to_numpy(), np.arange(len(self.names) + 1))
+
+    def name_cards(self, name_id, category=None, year=None, attributes=()):
+        """Return the cards of a name that pass the filters, as dicts."""
+        cards = self.cards
+        matches = []
+        for row in range(self.card_starts[name_id], self.card_starts[name_id + 1]):
+            if category is not None and cards["category"][row] != category:
+                continue
+            if year is not None and cards["year"][row] != year:
+                continue
+            if attributes and not set(attributes).issubset(cards["attributes"][row]):
+                continue
+            matches.append({column: cards[column][row] for column in self.card_columns})
+        return matches
+
+    def search(self, query, limit=10, min_score=0.5, category=None, year=None, attributes=()):
+        """
+        Return up to limit matches for query as dicts with the matched "name", its "score"
+        (the share of the query's trigrams found in the name, from 0 to 1) and its "cards",
+        best match first. Only names with at least one card passing the category, year and
+        attributes filters (every listed attribute must be present) are returned.
+        """
+        query_trigrams = word_trigrams(query)
+        postings = [self.names_by_trigram.array(trigram) for trigram in query_trigrams
+                    if trigram in self.names_by_trigram]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        candidates = np.flatnonzero(shared >= max(1, math.ceil(min_score * len(query_trigrams))))
+        containment = shared[candidates] / len(query_trigrams)
+        similarity = 2 * shared[candidates] / (len(query_trigrams) + self.trigram_counts[candidates])
+        # lexsort sorts by the last key first: best containment, then the closest whole name.
+        ranked = candidates[np.lexsort((-similarity, -containment))]
+
+        results = []
+        for name_id in ranked.tolist():
+            cards = self.name_cards(name_id, category, year, attributes)
+            if cards:
+                results.append({
+                    "name": self.names[name_id],
+                    "score": round(float(shared[name_id]) / len(query_trigrams), 3),
+                    "cards": cards,
+                })
+                if len(results) == limit:
+                    break
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the player name index written by build-parquet.py --name-index.")
+    parser.add_argument("query", help="Player name to look for (misspellings are tolerated)")
+    parser.add_argument("--index-dir", type=Path, default=DEFAULT_INDEX_DIR,
+                        help="Directory holding the name index (default: output/name-index)")
+    parser.add_argument("--category", help="Only return cards of this category, e.g. baseball")
+    parser.add_argument("--year", help="Only return cards of this year, e.g. 1989 or 1979-80")
+    parser.add_argument("--attribute", action="append", default=[],
+                        help="Only return cards with this attribute, e.g. RC (repeat for several)")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of names returned (default: 10)")
+    args = parser.parse_args()
+
+    index = NameSearchIndex(args.index_dir)
+    for match in index.search(args.query, args.limit, category=args.category, year=args.year,
+                              attributes=args.attribute):
+        print(f"{match['score']:.2f}  {match['name']}  ({len(match['cards'])} cards)")
+        for card in match["cards"][:5]:
+            attributes = f" [{', '.join(card['attributes'])}]" if card["attributes"] else ""
+            print(f"        {card['year']} {card['release']} - {card['set']} #{card['card_number']}{attributes}")
+
+if __name__ == "__main__":
+    main()
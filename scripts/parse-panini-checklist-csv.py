@@ -1,7 +1,13 @@
+import numpy as np
 import pandas as pd
-import json
+import argparse
+import glob
+import os
 import sys
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+import json_codec
 
 def generate_uuid():
     return str(uuid.uuid4())
@@ -17,6 +23,40 @@ def normalize_card_number(num_str):
         return str(int(num_str))
     return num_str
 
+def normalize_text_series(values):
+    """Vectorized normalize_text over a Series of strings."""
+    return values.str.strip()
+
+def normalize_card_number_series(values):
+    """Vectorized normalize_card_number over a Series of strings."""
+    values = normalize_text_series(values)
+    digits = values.str.isdigit()
+    ascii_digits = digits & values.str.isascii()
+    # For ASCII digits, dropping leading zeros is the same as str(int(...)).
+    stripped = values.str.lstrip("0").mask(lambda s: s == "", "0")
+    values = values.mask(ascii_digits, stripped)
+    other_digits = digits & ~ascii_digits
+    if other_digits.any():
+        values[other_digits] = values[other_digits].map(normalize_card_number)
+    return values
+
+def parse_sequence_series(values):
+    """
+    Vectorized sequence parsing: the integer value of each digit-only (trimmed) string,
+    or None, returned as a list of Python ints and None aligned with values.
+    """
+    values = normalize_text_series(values)
+    digits = values.str.isdigit().to_numpy()
+    sequences = [None] * len(values)
+    # Short ASCII digit strings are converted in one numpy pass; anything else falls back to int().
+    fast = digits & values.str.isascii().to_numpy() & (values.str.len() <= 18).to_numpy()
+    for position, value in zip(np.flatnonzero(fast), values[fast].astype("int64").tolist()):
+        sequences[position] = value
+    slow = digits & ~fast
+    for position, value in zip(np.flatnonzero(slow), values[slow].tolist()):
+        sequences[position] = int(value)
+    return sequences
+
 def get_attributes_for_set(set_name):
     """
     Return a list of attribute codes to apply to the set based on the set name.
@@ -33,196 +73,244 @@ def get_attributes_for_set(set_name):
         attrs.append("RELIC")
     return attrs
 
-def is_parallel_candidate(group1, group2):
+def base_signature(group):
     """
-    Returns True if group2 should be considered a parallel of group1.
+    Return the frozen set of normalized (card number, athlete) pairs in the base rows of group.
     (Used only when the "PARALLEL OF" column is not present.)
-    Currently, if the normalized set of (card number, athlete) pairs in the base rows
-    of both groups are equal, then group2 is a parallel candidate.
+    Two groups whose signatures are equal are parallel candidates of each other.
     """
-    def get_base_keys(group):
-        return {
-            (normalize_card_number(row["CARD NUMBER"]), normalize_text(row["ATHLETE"]))
-            for row in group["base_rows"]
-        }
-    return get_base_keys(group1) == get_base_keys(group2)
+    return frozenset((number, athlete) for number, athlete, _ in group["base_rows"])
 
-def process_csv_with_pandas(file_path):
-    # Load CSV into a pandas DataFrame. Fill missing values with an empty string.
-    df = pd.read_csv(file_path, dtype=str).fillna("")
-    
-    # Top-level metadata (assumed consistent across the CSV)
-    top_year    = normalize_text(df.loc[0, "YEAR"])
-    top_brand   = normalize_text(df.loc[0, "BRAND"])
-    top_program = normalize_text(df.loc[0, "PROGRAM"])
-    top_sport   = normalize_text(df.loc[0, "SPORT"])
-    
-    groups = []
-    # --- Grouping Step ---
-    # If the CSV has a "PARALLEL OF" column, use it to determine the effective base set.
-    if "PARALLEL OF" in df.columns:
-        groups_by_manual = {}
-        for _, row in df.iterrows():
-            card_set = normalize_text(row["CARD SET"])
-            parallel_of = normalize_text(row["PARALLEL OF"])
-            # Use the PARALLEL OF value if present; otherwise, fall back to CARD SET.
-            effective_base = parallel_of if parallel_of != "" else card_set
-            if effective_base not in groups_by_manual:
-                groups_by_manual[effective_base] = {
-                    "base_set": effective_base,
-                    "base_rows": [],
-                    "parallel_rows": []
-                }
-            # If PARALLEL OF is non-empty and CARD SET differs from effective_base, treat the row as a parallel.
-            if parallel_of != "" and card_set != effective_base:
-                # Apply parallel name logic: if card_set starts with effective_base + " ",
-                # trim that prefix.
-                if card_set.startswith(effective_base + " "):
-                    parallel_name = normalize_text(card_set[len(effective_base) + 1:]).strip(" -")
-                else:
-                    parallel_name = card_set
-                groups_by_manual[effective_base]["parallel_rows"].append((row, parallel_name))
-            else:
-                groups_by_manual[effective_base]["base_rows"].append(row)
-        groups = list(groups_by_manual.values())
-    else:
-        # Use original grouping logic based on "starts-with" rule.
-        current_group = None
-        current_base = None
-        for _, row in df.iterrows():
-            card_set = normalize_text(row["CARD SET"])
-            if current_group is None:
-                current_group = {
-                    "base_set": card_set,
-                    "base_rows": [row],
-                    "parallel_rows": []  # holds tuples: (row, parallel_name)
-                }
-                current_base = card_set
+def normalize_checklist(df):
+    """
+    Return a DataFrame with the normalized columns used for grouping, computed with
+    vectorized string operations: "card_set", "number", "athlete" and "sequence"
+    (a Python int or None). The index matches df.
+    """
+    return pd.DataFrame({
+        "card_set": normalize_text_series(df["CARD SET"]),
+        "number": normalize_card_number_series(df["CARD NUMBER"]),
+        "athlete": normalize_text_series(df["ATHLETE"]),
+        "sequence": pd.Series(parse_sequence_series(df["SEQUENCE"]), index=df.index, dtype=object),
+    }, index=df.index)
+
+def row_tuples(rows):
+    """
+    Return the normalized rows as compact (card number, athlete, sequence) tuples. Numbers and
+    athletes are interned, so parallel rows share the strings of the base card they repeat.
+    """
+    return list(zip(map(sys.intern, rows["number"]), map(sys.intern, rows["athlete"]), rows["sequence"]))
+
+def new_group(base_set):
+    return {
+        "base_set": base_set,
+        "base_rows": [],  # (card number, athlete, sequence) tuples
+        "parallel_rows": {}  # parallel name -> (card number, athlete, sequence) tuples
+    }
+
+class ChecklistAccumulator:
+    """
+    Folds a checklist, one DataFrame chunk at a time, into per-set groups of compact row tuples,
+    so only the normalized card number, athlete and sequence of each row are kept in memory.
+    Groups and parallel names are kept in order of first appearance, whatever the chunk size.
+    """
+
+    def __init__(self):
+        self.metadata = None
+        self.has_parallel_of = False
+        self.rows = 0
+        self.groups = []
+        self.groups_by_base = {}
+        self.current_group = None
+
+    def add(self, df):
+        if df.empty:
+            return
+        if self.metadata is None:
+            self.metadata = release_metadata(df)
+            self.has_parallel_of = "PARALLEL OF" in df.columns
+        self.rows += len(df)
+
+        # Normalize card sets, numbers, athletes and sequences for every row of the chunk at once.
+        rows = normalize_checklist(df)
+        # If the CSV has a "PARALLEL OF" column, use it to determine the effective base set.
+        if self.has_parallel_of:
+            self.add_parallel_of(df, rows)
+        else:
+            # Use original grouping logic based on "starts-with" rule.
+            self.add_set_prefix(rows)
+
+    def add_parallel_of(self, df, rows):
+        """
+        Group rows using the "PARALLEL OF" column: a row belongs to the set named in PARALLEL OF
+        (falling back to its CARD SET) and is a parallel row when its CARD SET differs from that set.
+        """
+        parallel_of = normalize_text_series(df["PARALLEL OF"])
+        # Use the PARALLEL OF value if present; otherwise, fall back to CARD SET.
+        effective_base = parallel_of.where(parallel_of != "", rows["card_set"])
+        # If PARALLEL OF is non-empty and CARD SET differs from effective_base, treat the row as a parallel.
+        is_parallel = (parallel_of != "") & (rows["card_set"] != effective_base)
+
+        for base_set, group_rows in rows.groupby(effective_base, sort=False):
+            group = self.groups_by_base.get(base_set)
+            if group is None:
+                group = self.groups_by_base[base_set] = new_group(base_set)
+                self.groups.append(group)
+            group_is_parallel = is_parallel[group_rows.index]
+            group["base_rows"].extend(row_tuples(group_rows[~group_is_parallel]))
+            parallel_rows = group_rows[group_is_parallel]
+            if not len(parallel_rows):
+                continue
+            # Apply parallel name logic: if card_set starts with base_set + " ", trim that prefix.
+            card_sets = parallel_rows["card_set"]
+            trimmed = card_sets.str[len(base_set) + 1:].str.strip().str.strip(" -")
+            parallel_names = trimmed.where(card_sets.str.startswith(base_set + " "), card_sets)
+            for parallel_name, name_rows in parallel_rows.groupby(parallel_names, sort=False):
+                group["parallel_rows"].setdefault(parallel_name, []).extend(row_tuples(name_rows))
+
+    def add_set_prefix(self, rows):
+        """
+        Group rows using the "starts-with" rule: consecutive rows whose CARD SET equals the current
+        base set are base rows, rows whose CARD SET starts with the base set plus a space are
+        parallels of it, and any other CARD SET starts a new group. Rows are first collapsed into
+        runs of identical CARD SET values, so the sequential scan only visits each run once; the
+        current group carries over from one chunk to the next.
+        """
+        card_sets = rows["card_set"]
+        run_starts = np.flatnonzero(card_sets.ne(card_sets.shift()).to_numpy())
+        run_ends = np.append(run_starts[1:], len(rows))
+        run_sets = card_sets.iloc[run_starts].tolist()
+
+        current_group = self.current_group
+        for start, end, card_set in zip(run_starts, run_ends, run_sets):
+            run_rows = row_tuples(rows.iloc[start:end])
+            current_base = current_group["base_set"] if current_group is not None else None
+            if current_group is not None and card_set == current_base:
+                current_group["base_rows"].extend(run_rows)
+            elif current_group is not None and card_set.startswith(current_base + " "):
+                parallel_name = normalize_text(card_set[len(current_base) + 1:]).strip(" -")
+                current_group["parallel_rows"].setdefault(parallel_name, []).extend(run_rows)
             else:
-                if card_set == current_base or card_set.startswith(current_base + " "):
-                    if card_set == current_base:
-                        current_group["base_rows"].append(row)
-                    else:
-                        parallel_name = normalize_text(card_set[len(current_base) + 1:]).strip(" -")
-                        current_group["parallel_rows"].append((row, parallel_name))
-                else:
-                    groups.append(current_group)
-                    current_group = {
-                        "base_set": card_set,
-                        "base_rows": [row],
-                        "parallel_rows": []
-                    }
-                    current_base = card_set
-        if current_group is not None:
-            groups.append(current_group)
-        
-        # Merge adjacent groups using existing matching logic.
+                current_group = new_group(card_set)
+                current_group["base_rows"].extend(run_rows)
+                self.groups.append(current_group)
+        self.current_group = current_group
+
+    def finish(self):
+        """Return the groups to turn into sets, in order of first appearance."""
+        if self.has_parallel_of:
+            return self.groups
+
+        # Merge groups whose base rows match an earlier group; the signature map finds the
+        # first such group without comparing against every merged group.
         merged_groups = []
-        for group in groups:
-            merged = False
-            for m_group in merged_groups:
-                if is_parallel_candidate(m_group, group):
-                    for row in group["base_rows"]:
-                        m_group["parallel_rows"].append((row, normalize_text(group["base_set"])))
-                    for tup in group["parallel_rows"]:
-                        m_group["parallel_rows"].append(tup)
-                    merged = True
-                    break
-            if not merged:
+        groups_by_signature = {}
+        for group in self.groups:
+            signature = base_signature(group)
+            m_group = groups_by_signature.get(signature)
+            if m_group is not None:
+                m_group["parallel_rows"].setdefault(group["base_set"], []).extend(group["base_rows"])
+                for parallel_name, parallel_rows in group["parallel_rows"].items():
+                    m_group["parallel_rows"].setdefault(parallel_name, []).extend(parallel_rows)
+            else:
+                groups_by_signature[signature] = group
                 merged_groups.append(group)
-        groups = merged_groups
+        return merged_groups
+
+def read_checklist(file_path, chunksize=None):
+    """
+    Load a checklist CSV (strings, with missing values as empty strings) into a
+    ChecklistAccumulator. With a chunksize, the CSV is streamed that many rows at a time,
+    so memory is bounded by the accumulated cards rather than the raw rows.
+    """
+    checklist = ChecklistAccumulator()
+    if chunksize is None:
+        checklist.add(pd.read_csv(file_path, dtype=str).fillna(""))
+    else:
+        for chunk in pd.read_csv(file_path, dtype=str, chunksize=chunksize):
+            checklist.add(chunk.fillna(""))
+    return checklist
+
+def release_metadata(df):
+    """Return the top-level metadata (assumed consistent across the CSV) from the first row."""
+    first = df.iloc[0]
+    return {
+        "year": normalize_text(first["YEAR"]),
+        "brand": normalize_text(first["BRAND"]),
+        "program": normalize_text(first["PROGRAM"]),
+        "sport": normalize_text(first["SPORT"]),
+    }
+
+def process_csv_with_pandas(file_path, chunksize=None):
+    return build_release(read_checklist(file_path, chunksize))
+
+def build_release(checklist):
+    if checklist.metadata is None:
+        raise ValueError("Checklist has no rows")
+
+    # Top-level metadata (assumed consistent across the CSV)
+    top_year    = checklist.metadata["year"]
+    top_brand   = checklist.metadata["brand"]
+    top_program = checklist.metadata["program"]
+    top_sport   = checklist.metadata["sport"]
+    
+    # --- Grouping Step ---
+    groups = checklist.finish()
     
     # Process each group into a set object.
     sets = []
     for group in groups:
         base_set = group["base_set"]
         base_rows = group["base_rows"]
-        parallel_rows = group["parallel_rows"]
         
         # Get attributes from the set name.
         set_attributes = get_attributes_for_set(base_set)
         
+        # Determine if the base cards share a uniform (non-None) sequence.
+        base_card_numbers = {card_number for card_number, _, _ in base_rows}
+        base_sequences = {seq_value for _, _, seq_value in base_rows if seq_value is not None}
+        uniform_base_seq = False
+        if len(base_sequences) == 1:
+            set_numberedTo = base_sequences.pop()
+            uniform_base_seq = True
+        
         # Process base rows into card objects.
         base_cards = []
-        base_card_numbers = set()
-        base_sequences = set()
-        for row in base_rows:
-            card_number = normalize_card_number(row["CARD NUMBER"])
-            athlete = normalize_text(row["ATHLETE"])
-            seq_str = normalize_text(row["SEQUENCE"])
-            seq_value = int(seq_str) if seq_str.isdigit() else None
-            
-            base_card_numbers.add(card_number)
-            if seq_value is not None:
-                base_sequences.add(seq_value)
-                
+        for card_number, athlete, seq_value in base_rows:
             card_obj = {
                 "uniqueId": generate_uuid(),
                 "number": card_number,
                 "name": athlete,
             }
-            # Temporarily store sequence for later decision.
-            card_obj["_sequence"] = seq_value
-            # Prepare placeholder for card-level parallels.
-            card_obj["parallels"] = []
+            if not uniform_base_seq and seq_value is not None:
+                card_obj["numberedTo"] = seq_value
             base_cards.append(card_obj)
-        
-        # Determine if the base cards share a uniform (non-None) sequence.
-        uniform_base_seq = False
-        if base_sequences and len(base_sequences) == 1 and (None not in base_sequences):
-            set_numberedTo = base_sequences.pop()
-            uniform_base_seq = True
-        
-        # Clean up base card objects.
+        # Index the first card with each number, which is the one parallel rows attach to.
+        cards_by_number = {}
         for card_obj in base_cards:
-            if uniform_base_seq:
-                card_obj.pop("_sequence", None)
-            else:
-                if card_obj.get("_sequence") is not None:
-                    card_obj["numberedTo"] = card_obj["_sequence"]
-                card_obj.pop("_sequence", None)
-            if "parallels" in card_obj and not card_obj["parallels"]:
-                del card_obj["parallels"]
-        
-        # Process parallel rows.
-        parallels_by_name = {}
-        for row, parallel_name in parallel_rows:
-            parallels_by_name.setdefault(parallel_name, []).append(row)
+            cards_by_number.setdefault(card_obj["number"], card_obj)
         
+        # Process parallel rows, grouped by parallel name in order of first appearance.
         set_level_parallels = []
-        for parallel_name, rows_list in parallels_by_name.items():
-            parallel_card_numbers = set()
-            parallel_sequences = set()
-            for row in rows_list:
-                card_number = normalize_card_number(row["CARD NUMBER"])
-                parallel_card_numbers.add(card_number)
-                seq_str = normalize_text(row["SEQUENCE"])
-                seq_value = int(seq_str) if seq_str.isdigit() else None
-                if seq_value is not None:
-                    parallel_sequences.add(seq_value)
+        for parallel_name, rows_list in group["parallel_rows"].items():
+            parallel_card_numbers = {card_number for card_number, _, _ in rows_list}
+            parallel_sequences = {seq_value for _, _, seq_value in rows_list if seq_value is not None}
             if parallel_card_numbers == base_card_numbers:
                 parallel_obj = {"name": parallel_name}
-                if parallel_sequences and len(parallel_sequences) == 1 and (None not in parallel_sequences):
+                if len(parallel_sequences) == 1:
                     parallel_obj["numberedTo"] = parallel_sequences.pop()
                 set_level_parallels.append(parallel_obj)
             else:
-                for row in rows_list:
-                    card_number = normalize_card_number(row["CARD NUMBER"])
-                    seq_str = normalize_text(row["SEQUENCE"])
-                    seq_value = int(seq_str) if seq_str.isdigit() else None
+                for card_number, athlete, seq_value in rows_list:
                     parallel_obj = {"name": parallel_name}
                     if seq_value is not None:
                         parallel_obj["numberedTo"] = seq_value
-                    found = False
-                    for card_obj in base_cards:
-                        if card_obj["number"] == card_number:
-                            if "parallels" not in card_obj:
-                                card_obj["parallels"] = []
-                            card_obj["parallels"].append(parallel_obj)
-                            found = True
-                            break
-                    if not found:
-                        athlete = normalize_text(row["ATHLETE"])
+                    card_obj = cards_by_number.get(card_number)
+                    if card_obj is not None:
+                        if "parallels" not in card_obj:
+                            card_obj["parallels"] = []
+                        card_obj["parallels"].append(parallel_obj)
+                    else:
                         new_card = {
                             "uniqueId": generate_uuid(),
                             "number": card_number,
@@ -233,6 +321,7 @@ def process_csv_with_pandas(file_path):
                             new_card["numberedTo"] = seq_value
                         new_card["parallels"] = [parallel_obj]
                         base_cards.append(new_card)
+                        cards_by_number[card_number] = new_card
                         base_card_numbers.add(card_number)
         
         # --- Duplicate Removal Step ---
@@ -284,15 +373,156 @@ def process_csv_with_pandas(file_path):
     
     return top_obj
 
-if __name__ == "__main__":
-    if len(sys.argv) != 3:
+def format_filename(name):
+    """
+    Cleans up the release name by replacing spaces with '-' and removing apostrophes.
+    """
+    return name.replace(" ", "-").replace("'", "")
+
+def release_file_path(categories_dir, metadata):
+    """
+    Builds the path of the Release JSON for metadata using the pattern:
+      <categories_dir>/<sport>/<year>/<year>-<brand>-<program>.json
+    """
+    release_name = format_filename(f"{metadata['brand']} {metadata['program']}")
+    return os.path.join(categories_dir, metadata["sport"].lower(), metadata["year"],
+                        f"{metadata['year']}-{release_name}.json")
+
+def write_release(release, output_json, indent=2):
+    with open(output_json, "w", encoding="utf-8") as f:
+        json_codec.dump(release, f, indent=indent)
+
+def count_cards(release):
+    return sum(len(set_obj["cards"]) for set_obj in release["sets"])
+
+def list_batch_inputs(source):
+    """
+    Return the CSV files to convert in batch mode. source is either a directory (every *.csv
+    in it, sorted by name) or a manifest file listing one CSV path per line; blank lines and
+    lines starting with '#' are skipped and relative paths are resolved against the manifest.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.csv")))
+    base_dir = os.path.dirname(os.path.abspath(source))
+    inputs = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                inputs.append(os.path.join(base_dir, line))
+    return inputs
+
+def plan_batch(inputs, categories_dir):
+    """
+    Resolve the Release path of every input from its first row, so each CSV is assigned its
+    output before any worker starts. Returns (input_csv, output_json, problem) tuples, where
+    problem describes why the input cannot be converted (or is None).
+    """
+    plan = []
+    claimed = {}
+    for input_csv in inputs:
+        try:
+            metadata = release_metadata(pd.read_csv(input_csv, dtype=str, nrows=1).fillna(""))
+        except Exception as e:
+            plan.append((input_csv, None, f"error: {e}"))
+            continue
+        output_json = release_file_path(categories_dir, metadata)
+        if output_json in claimed:
+            # Two checklists for the same Release would overwrite each other.
+            plan.append((input_csv, output_json, f"error: same Release as {claimed[output_json]}"))
+            continue
+        claimed[output_json] = input_csv
+        plan.append((input_csv, output_json, None))
+    return plan
+
+def convert_checklist(task):
+    """
+    Convert one checklist CSV and write it to output_json. Runs in a worker process; returns
+    a summary dict instead of raising so one bad CSV does not stop the batch.
+    """
+    input_csv, output_json, overwrite, chunksize = task
+    start = time.perf_counter()
+    summary = {"input": input_csv, "output": output_json, "rows": 0, "cards": 0, "status": "ok"}
+    try:
+        if os.path.exists(output_json) and not overwrite:
+            summary["status"] = "exists"
+        else:
+            checklist = read_checklist(input_csv, chunksize)
+            summary["rows"] = checklist.rows
+            release = build_release(checklist)
+            summary["cards"] = count_cards(release)
+            os.makedirs(os.path.dirname(output_json), exist_ok=True)
+            # Release files in the repository are indented with 4 spaces.
+            write_release(release, output_json, indent=4)
+    except Exception as e:
+        summary["status"] = f"error: {e}"
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+def run_batch(source, categories_dir, workers, overwrite, chunksize=None):
+    """
+    Convert every CSV listed by source in a pool of worker processes and print a per-file
+    timing and row-count summary. Returns the number of files that failed.
+    """
+    inputs = list_batch_inputs(source)
+    if not inputs:
+        print(f"No CSV files found in {source}")
+        return 0
+
+    start = time.perf_counter()
+    plan = plan_batch(inputs, categories_dir)
+    tasks = [(input_csv, output_json, overwrite, chunksize) for input_csv, output_json, problem in plan if problem is None]
+    with ProcessPoolExecutor(max_workers=workers or None) as executor:
+        converted = iter(list(executor.map(convert_checklist, tasks)))
+
+    summaries = []
+    for input_csv, output_json, problem in plan:
+        if problem is None:
+            summaries.append(next(converted))
+        else:
+            summaries.append({"input": input_csv, "output": output_json, "rows": 0, "cards": 0,
+                              "status": problem, "seconds": 0.0})
+
+    failures = 0
+    for summary in summaries:
+        print(f"{summary['seconds']:8.2f}s {summary['rows']:8d} rows {summary['cards']:7d} cards  "
+              f"{summary['input']} -> {summary['output'] or '-'} [{summary['status']}]")
+        if summary["status"].startswith("error"):
+            failures += 1
+    written = sum(1 for summary in summaries if summary["status"] == "ok")
+    print(f"Converted {written} of {len(summaries)} checklists in {time.perf_counter() - start:.2f}s "
+          f"({failures} failed)")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert Panini checklist CSVs into Release JSON files.")
+    parser.add_argument("input_csv", nargs="?", help="Checklist CSV to convert")
+    parser.add_argument("output_json", nargs="?", help="Where to write the Release JSON")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Convert every CSV in a directory, or listed in a manifest file, into the categories folder")
+    parser.add_argument("--categories-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "categories"),
+                        help="Categories folder batch output is written to (default: the repository's categories folder)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of worker processes in batch mode (default: one per CPU)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace Release files that already exist in batch mode")
+    parser.add_argument("--chunksize", type=int,
+                        help="Stream the CSV this many rows at a time instead of loading it whole")
+    args = parser.parse_args()
+
+    if args.batch:
+        if args.input_csv or args.output_json:
+            parser.error("input.csv and output.json cannot be combined with --batch")
+        sys.exit(1 if run_batch(args.batch, os.path.normpath(args.categories_dir), args.workers, args.overwrite, args.chunksize) else 0)
+
+    if not args.input_csv or not args.output_json:
         print("Usage: python script.py input.csv output.json")
+        print("       python script.py --batch <directory or manifest> [--categories-dir DIR] [--workers N] [--overwrite] [--chunksize N]")
         sys.exit(1)
-        
-    input_csv = sys.argv[1]
-    output_json = sys.argv[2]
-    
-    result = process_csv_with_pandas(input_csv)
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2)
-    print(f"JSON output written to {output_json}")
+
+    result = process_csv_with_pandas(args.input_csv, args.chunksize)
+    write_release(result, args.output_json)
+    print(f"JSON output written to {args.output_json}")
+
+if __name__ == "__main__":
+    main()
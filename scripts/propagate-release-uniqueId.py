@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import json
+import argparse
 import sys
 import os
 from collections import OrderedDict
+import json_codec
+from json_rewrite import load_json, map_files, write_json
 
 def format_filename(name):
     """
@@ -45,81 +47,129 @@ def reorder_release_data(release_data, unique_id):
 
     return new_data
 
-def update_release_file(base_dir, category, year, release_name, unique_id):
+def release_file_path(base_dir, category, year, release_name):
     """
-    Builds the relative file path using the pattern:
+    Builds the file path of a release using the pattern:
       <base_dir>/<category>/<year>/<year>-<formatted_release_name>.json
-    Opens the JSON file at that location, updates its top-level "uniqueId" (in the proper order),
-    and writes the updated JSON back to disk with 4-space indentation.
     """
-    formatted_name = format_filename(release_name)
-    file_name = f"{year}-{formatted_name}.json"
-    file_path = os.path.join(base_dir, category, year, file_name)
-    
+    return os.path.join(base_dir, category, year, f"{year}-{format_filename(release_name)}.json")
+
+def build_catalog(base_dir, category_obj):
+    """
+    Resolves every release entry of a category to its file, listing the category folder once.
+    Returns (tasks, missing, orphans):
+      - tasks: (file path, uniqueId) for every indexed entry with a uniqueId and a file,
+      - missing: (year, release name, expected path) for indexed entries without a file,
+      - orphans: release files that no entry of the category resolves to.
+    """
+    category_name = category_obj["name"]
+    files = set()
+    category_dir = os.path.join(base_dir, category_name)
+    if os.path.isdir(category_dir):
+        for year_dir in os.scandir(category_dir):
+            if year_dir.is_dir():
+                files.update(entry.path for entry in os.scandir(year_dir.path)
+                             if entry.is_file() and entry.name.endswith(".json"))
+
+    tasks, missing, resolved = [], [], set()
+    for year_obj in category_obj.get("years", []):
+        year_value = year_obj.get("year")
+        if not year_value:
+            print("Warning: 'year' value missing, skipping entry.")
+            continue
+        for release in year_obj.get("releases", []):
+            release_name = release.get("name")
+            if not release_name:
+                continue
+            file_path = release_file_path(base_dir, category_name, year_value, release_name)
+            if file_path in files:
+                resolved.add(file_path)
+            # Process only releases that are indexed and have a uniqueId.
+            if release.get("indexed") is not True or not release.get("uniqueId"):
+                continue
+            if file_path in files:
+                tasks.append((file_path, release["uniqueId"]))
+            else:
+                missing.append((year_value, release_name, file_path))
+    return tasks, missing, sorted(files - resolved)
+
+def update_release_file(task):
+    """
+    Sets the top-level "uniqueId" of a release file (in the proper key order) and writes it
+    back in its own formatting, only if that changes the document.
+    task is a (file path, uniqueId) tuple; runs in the worker processes, so it must stay a
+    module-level function. Returns (file path, status) where status is "updated",
+    "unchanged" or an error message.
+    """
+    file_path, unique_id = task
     try:
-        with open(file_path, 'r') as f:
-            # Load JSON preserving key order.
-            release_data = json.load(f, object_pairs_hook=OrderedDict)
+        # Load JSON (dicts preserve key order).
+        release_data, original = load_json(file_path)
     except Exception as e:
-        print(f"Error reading file '{file_path}': {e}")
-        return
-    
+        return file_path, f"Error reading file '{file_path}': {e}"
+
     # Reorder the data with uniqueId inserted after version.
     new_release_data = reorder_release_data(release_data, unique_id)
-    
+    # Same keys in the same order with the same values: leave the file (and its formatting) alone.
+    if list(new_release_data.items()) == list(release_data.items()):
+        return file_path, "unchanged"
+
     try:
-        with open(file_path, 'w') as f:
-            json.dump(new_release_data, f, indent=4)
-        print(f"Updated '{file_path}' with uniqueId: {unique_id}")
+        written = write_json(file_path, new_release_data, original)
     except Exception as e:
-        print(f"Error writing file '{file_path}': {e}")
+        return file_path, f"Error writing file '{file_path}': {e}"
+    return file_path, "updated" if written else "unchanged"
 
 def main():
-    if len(sys.argv) != 2:
-        print(f"Usage: {sys.argv[0]} <category_json_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Copy the uniqueId of every indexed release in category JSON files to its release file.")
+    parser.add_argument("category_json_files", nargs="+", help="Category JSON file(s), e.g. ../categories/baseball.json")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of processes used to update release files (0 = one per CPU, default: 0)")
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
 
-    category_json_file = sys.argv[1]
-    # Use the directory of the category JSON file as the base directory for relative paths.
-    base_dir = os.path.dirname(os.path.abspath(category_json_file))
-    
-    try:
-        with open(category_json_file, 'r') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"Error reading category JSON file '{category_json_file}': {e}")
-        sys.exit(1)
-    
-    # According to the new schema, the top-level object must contain "category".
-    category_obj = data.get("category")
-    if not category_obj:
-        print("Error: 'category' property not found in the JSON file.")
-        sys.exit(1)
-    
-    category_name = category_obj.get("name")
-    if not category_name:
-        print("Error: 'name' property not found in the category.")
+    tasks = []
+    for category_json_file in args.category_json_files:
+        # Use the directory of the category JSON file as the base directory for relative paths.
+        base_dir = os.path.dirname(os.path.abspath(category_json_file))
+
+        try:
+            data = json_codec.load_path(category_json_file)
+        except Exception as e:
+            print(f"Error reading category JSON file '{category_json_file}': {e}")
+            sys.exit(1)
+
+        # According to the new schema, the top-level object must contain "category".
+        category_obj = data.get("category")
+        if not category_obj:
+            print("Error: 'category' property not found in the JSON file.")
+            sys.exit(1)
+
+        if not category_obj.get("name"):
+            print("Error: 'name' property not found in the category.")
+            sys.exit(1)
+
+        category_tasks, missing, orphans = build_catalog(base_dir, category_obj)
+        tasks.extend(category_tasks)
+        for year_value, release_name, file_path in missing:
+            print(f"Missing file for indexed release '{release_name}' ({year_value}): expected '{file_path}'")
+        for file_path in orphans:
+            print(f"No release entry in '{category_json_file}' for file '{file_path}'")
+
+    counts = {"updated": 0, "unchanged": 0, "errors": 0}
+    for file_path, status in map_files(update_release_file, tasks, workers):
+        if status == "updated":
+            print(f"Updated '{file_path}'")
+            counts["updated"] += 1
+        elif status == "unchanged":
+            counts["unchanged"] += 1
+        else:
+            print(status)
+            counts["errors"] += 1
+    print(f"{counts['updated']} release files updated, {counts['unchanged']} unchanged, {counts['errors']} errors")
+    if counts["errors"]:
         sys.exit(1)
-    
-    years = category_obj.get("years", [])
-    for year_obj in years:
-        year_value = year_obj.get("year")
-        if not year_value:
-            print("Warning: 'year' value missing, skipping entry.")
-            continue
-        
-        releases = year_obj.get("releases", [])
-        for release in releases:
-            # Process only releases that are indexed.
-            if release.get("indexed") is not True:
-                continue
-            unique_id = release.get("uniqueId")
-            if not unique_id:
-                continue  # Skip if uniqueId is not present.
-            release_name = release.get("name")
-            if not release_name:
-                continue
-            update_release_file(base_dir, category_name, year_value, release_name, unique_id)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,271 @@
+"""
+Binary sidecars for random access to the sets and cards of a release.
+
+A sidecar is generated from a release JSON file, which stays the source of truth, and is
+read through mmap: looking up a set or card by uniqueId binary-searches a sorted key table
+and decodes only that record. Sidecars are kept under output/sidecars/, mirroring
+categories/, and are rebuilt whenever the SHA-256 of their release file changes.
+
+Layout (little-endian):
+
+    header        magic, version, SHA-256 of the release JSON, record counts and the offsets
+                  of the sections below
+    records       compact UTF-8 JSON: the release without its sets, then each set without its
+                  cards followed by its cards, in document order
+    set table     per set: record offset, record length, first card ordinal, card count
+    card table    per card: record offset, record length, set ordinal
+    set keys      per set: 16-byte uniqueId, set ordinal; sorted by uniqueId
+    card keys     per card: 16-byte uniqueId, card ordinal; sorted by uniqueId
+
+Run this file to refresh every sidecar, or to print one set or card:
+
+    python release_sidecar.py build
+    python release_sidecar.py get ../categories/baseball/2025/2025-Topps.json <uniqueId>
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import uuid
+from pathlib import Path
+import json_codec
+
+REPO_DIR = Path(__file__).parent.parent
+DEFAULT_CATEGORIES_DIR = REPO_DIR / "categories"
+DEFAULT_SIDECAR_DIR = REPO_DIR / "output" / "sidecars"
+SIDECAR_SUFFIX = ".cards"
+
+MAGIC = b"CLSC"
+VERSION = 1
+HEADER = struct.Struct("<4sHH32sII6Q")
+SET_ENTRY = struct.Struct("<QIII")
+CARD_ENTRY = struct.Struct("<QII")
+KEY_ENTRY = struct.Struct("<16sI")
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+def uuid_key(unique_id):
+    """Return the 16-byte key of a uniqueId, or None if it is not a UUID."""
+    try:
+        return uuid.UUID(unique_id).bytes
+    except (TypeError, ValueError):
+        return None
+
+def encode(record):
+    return json_codec.dumps_bytes(record, ensure_ascii=False, separators=(",", ":"))
+
+def sorted_keys(unique_ids, kind):
+    keys = []
+    for ordinal, unique_id in enumerate(unique_ids):
+        key = uuid_key(unique_id)
+        if key is None:
+            raise ValueError(f"{kind} uniqueId {unique_id!r} is not a UUID")
+        keys.append((key, ordinal))
+    keys.sort()
+    return b"".join(KEY_ENTRY.pack(key, ordinal) for key, ordinal in keys)
+
+def build_sidecar(json_path, sidecar_path):
+    """Write the sidecar of a release JSON file, replacing any previous one atomically."""
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    release = json_codec.loads(raw)
+
+    records = bytearray(encode({key: value for key, value in release.items() if key != "sets"}))
+    release_length = len(records)
+    set_table = bytearray()
+    card_table = bytearray()
+    set_ids, card_ids = [], []
+    for set_ordinal, card_set in enumerate(release["sets"]):
+        cards = card_set.get("cards", [])
+        record = encode({key: value for key, value in card_set.items() if key != "cards"})
+        set_table += SET_ENTRY.pack(HEADER.size + len(records), len(record), len(card_ids), len(cards))
+        set_ids.append(card_set["uniqueId"])
+        records += record
+        for card in cards:
+            record = encode(card)
+            card_table += CARD_ENTRY.pack(HEADER.size + len(records), len(record), set_ordinal)
+            card_ids.append(card["uniqueId"])
+            records += record
+
+    set_keys = sorted_keys(set_ids, "Set")
+    card_keys = sorted_keys(card_ids, "Card")
+    sets_offset = HEADER.size + len(records)
+    cards_offset = sets_offset + len(set_table)
+    set_keys_offset = cards_offset + len(card_table)
+    card_keys_offset = set_keys_offset + len(set_keys)
+    header = HEADER.pack(MAGIC, VERSION, 0, hashlib.sha256(raw).digest(), len(set_ids), len(card_ids),
+                         HEADER.size, release_length, sets_offset, cards_offset, set_keys_offset, card_keys_offset)
+
+    sidecar_path = Path(sidecar_path)
+    sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = sidecar_path.with_name(sidecar_path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        for part in (header, records, set_table, card_table, set_keys, card_keys):
+            f.write(part)
+    os.replace(temp_path, sidecar_path)
+
+def sidecar_digest(sidecar_path):
+    """Return the release hash recorded in a sidecar, or None if it is missing or unreadable."""
+    try:
+        with open(sidecar_path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != HEADER.size:
+        return None
+    magic, version, _, digest = HEADER.unpack(header)[:4]
+    return digest if magic == MAGIC and version == VERSION else None
+
+def ensure_sidecar(json_path, sidecar_path):
+    """Rebuild the sidecar if the release file changed since it was written; return True if rebuilt."""
+    if sidecar_digest(sidecar_path) == file_digest(json_path):
+        return False
+    build_sidecar(json_path, sidecar_path)
+    return True
+
+def sidecar_path_for(json_path, categories_dir=DEFAULT_CATEGORIES_DIR, sidecar_dir=DEFAULT_SIDECAR_DIR):
+    relative = Path(json_path).resolve().relative_to(Path(categories_dir).resolve())
+    return Path(sidecar_dir) / relative.with_suffix(SIDECAR_SUFFIX)
+
+class ReleaseSidecar:
+    """A memory-mapped sidecar; records are decoded only when they are looked up."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.digest, self.set_count, self.card_count, self.release_offset,
+         self.release_length, self.sets_offset, self.cards_offset, self.set_keys_offset,
+         self.card_keys_offset) = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} release sidecar")
+
+    @classmethod
+    def open(cls, json_path, categories_dir=DEFAULT_CATEGORIES_DIR, sidecar_dir=DEFAULT_SIDECAR_DIR):
+        """Open the sidecar of a release file under categories_dir, rebuilding it first if stale."""
+        path = sidecar_path_for(json_path, categories_dir, sidecar_dir)
+        ensure_sidecar(json_path, path)
+        return cls(path)
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _find(self, keys_offset, count, unique_id):
+        """Binary-search a key table and return the ordinal stored for unique_id, or None."""
+        key = uuid_key(unique_id)
+        if key is None:
+            return None
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            start = keys_offset + middle * KEY_ENTRY.size
+            if self.mm[start:start + 16] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == count:
+            return None
+        found, ordinal = KEY_ENTRY.unpack_from(self.mm, keys_offset + low * KEY_ENTRY.size)
+        return ordinal if found == key else None
+
+    def _record(self, offset, length):
+        return json_codec.loads(self.mm[offset:offset + length])
+
+    def _set_entry(self, ordinal):
+        return SET_ENTRY.unpack_from(self.mm, self.sets_offset + ordinal * SET_ENTRY.size)
+
+    def _card(self, ordinal):
+        offset, length, _ = CARD_ENTRY.unpack_from(self.mm, self.cards_offset + ordinal * CARD_ENTRY.size)
+        return self._record(offset, length)
+
+    def release(self):
+        """Return the release fields other than its sets."""
+        return self._record(self.release_offset, self.release_length)
+
+    def get_set(self, unique_id, with_cards=False):
+        """Return the set with this uniqueId (its cards only if with_cards), or None."""
+        ordinal = self._find(self.set_keys_offset, self.set_count, unique_id)
+        if ordinal is None:
+            return None
+        offset, length, first_card, card_count = self._set_entry(ordinal)
+        card_set = self._record(offset, length)
+        if with_cards:
+            card_set["cards"] = [self._card(i) for i in range(first_card, first_card + card_count)]
+        return card_set
+
+    def get_card(self, unique_id):
+        """Return the card with this uniqueId, or None."""
+        ordinal = self._find(self.card_keys_offset, self.card_count, unique_id)
+        return None if ordinal is None else self._card(ordinal)
+
+    def card_set(self, unique_id):
+        """Return the set (without its cards) holding the card with this uniqueId, or None."""
+        ordinal = self._find(self.card_keys_offset, self.card_count, unique_id)
+        if ordinal is None:
+            return None
+        _, _, set_ordinal = CARD_ENTRY.unpack_from(self.mm, self.cards_offset + ordinal * CARD_ENTRY.size)
+        offset, length, _, _ = self._set_entry(set_ordinal)
+        return self._record(offset, length)
+
+def sync_sidecars(categories_dir, sidecar_dir, force=False):
+    """
+    Bring every sidecar under sidecar_dir up to date with the releases in categories_dir and
+    delete the sidecars of releases that no longer exist. Returns (rebuilt, unchanged, removed).
+    """
+    categories_dir, sidecar_dir = Path(categories_dir), Path(sidecar_dir)
+    rebuilt = unchanged = removed = 0
+    expected = set()
+    for json_path in sorted(categories_dir.glob("*/*/*.json")):
+        path = sidecar_path_for(json_path, categories_dir, sidecar_dir)
+        expected.add(path.resolve())
+        if force:
+            build_sidecar(json_path, path)
+            rebuilt += 1
+        elif ensure_sidecar(json_path, path):
+            rebuilt += 1
+        else:
+            unchanged += 1
+    for path in sidecar_dir.glob("*/*/*" + SIDECAR_SUFFIX):
+        if path.resolve() not in expected:
+            path.unlink()
+            removed += 1
+    return rebuilt, unchanged, removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Build release sidecars or look up one set or card in them.")
+    parser.add_argument("--categories-dir", type=Path, default=DEFAULT_CATEGORIES_DIR,
+                        help="Directory holding the release JSON files (default: categories)")
+    parser.add_argument("--sidecar-dir", type=Path, default=DEFAULT_SIDECAR_DIR,
+                        help="Directory the sidecars are written to (default: output/sidecars)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Rebuild stale sidecars and remove those of deleted releases")
+    build.add_argument("--force", action="store_true", help="Rebuild every sidecar, even if up to date")
+    get = commands.add_parser("get", help="Print the set or card with a uniqueId as JSON")
+    get.add_argument("release", type=Path, help="Release JSON file under the categories directory")
+    get.add_argument("unique_id", help="uniqueId of a set or card in the release")
+    get.add_argument("--with-cards", action="store_true", help="Include the cards when printing a set")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        rebuilt, unchanged, removed = sync_sidecars(args.categories_dir, args.sidecar_dir, args.force)
+        print(f"Sidecars in {args.sidecar_dir}: {rebuilt} rebuilt, {unchanged} up to date, {removed} removed")
+        return
+
+    with ReleaseSidecar.open(args.release, args.categories_dir, args.sidecar_dir) as sidecar:
+        record = sidecar.get_set(args.unique_id, args.with_cards) or sidecar.get_card(args.unique_id)
+    if record is None:
+        print(f"No set or card with uniqueId {args.unique_id} in {args.release}")
+        raise SystemExit(1)
+    print(json_codec.dumps(record, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
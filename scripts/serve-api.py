@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+import json_codec
+from card_query import CardIndex, DEFAULT_DATASET
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_REQUEST_HEAD = 16 * 1024
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 431: "Request Header Fields Too Large"}
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def page_params(query):
+    """Return (offset, limit) from the query string, raising ApiError on bad values."""
+    try:
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(DEFAULT_LIMIT)])[0])
+    except ValueError:
+        raise ApiError(400, "offset and limit must be integers")
+    if offset < 0 or not 1 <= limit <= MAX_LIMIT:
+        raise ApiError(400, f"offset must be >= 0 and limit between 1 and {MAX_LIMIT}")
+    return offset, limit
+
+def page(items, query):
+    offset, limit = page_params(query)
+    return {"total": len(items), "offset": offset, "limit": limit, "items": items[offset:offset + limit]}
+
+class CardApi:
+    """
+    Read-only JSON API over a CardIndex:
+
+      GET /releases                          every release (paginated)
+      GET /releases/<uniqueId>               one release and its sets
+      GET /releases/<uniqueId>/cards/<number> every record with that card number in the release
+      GET /sets/<uniqueId>                   one set and its records (paginated)
+      GET /cards/<uniqueId>                  one record (base card, parallel or variation)
+      GET /search?q=<name>                   records whose card name contains every word of q,
+                                             optionally filtered by category and year (paginated)
+
+    Responses are cached in an LRU keyed by the request target and carry an ETag derived from
+    their body, so clients revalidating with If-None-Match get a 304 without a body.
+    """
+
+    def __init__(self, index, cache_size):
+        self.index = index
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.columns = {name: values for name, is_scalar, values in index.columns if is_scalar}
+
+        # Release summaries and their sets (in dataset order) are computed once at startup.
+        self.release_by_id = {}
+        self.release_sets = {}
+        for release_id in index.rows_by_release:
+            rows = index.release_rows(release_id)
+            self.release_by_id[release_id] = {
+                key: self.columns[key][rows[0]]
+                for key in ("release_unique_id", "category", "year", "release", "release_name")
+            }
+            sets = OrderedDict()
+            for row in rows:
+                set_id = self.columns["set_unique_id"][row]
+                if set_id not in sets:
+                    sets[set_id] = self.set_summary(row)
+            self.release_sets[release_id] = list(sets.values())
+        self.releases = sorted(self.release_by_id.values(),
+                               key=lambda release: (release["category"], release["year"], release["release"]))
+
+    def set_summary(self, row):
+        return {"set_unique_id": self.columns["set_unique_id"][row], "set": self.columns["set"][row]}
+
+    def route(self, target):
+        """Return the JSON-serializable body for a request target, raising ApiError otherwise."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+
+        if parts == ["releases"]:
+            return page(self.releases, query)
+        if len(parts) == 2 and parts[0] == "releases":
+            if parts[1] not in self.release_by_id:
+                raise ApiError(404, "release not found")
+            return dict(self.release_by_id[parts[1]], sets=self.release_sets[parts[1]])
+        if len(parts) == 4 and parts[0] == "releases" and parts[2] == "cards":
+            records = self.index.cards_by_number(parts[1], parts[3])
+            if not records:
+                raise ApiError(404, "card not found")
+            return {"items": records}
+        if len(parts) == 2 and parts[0] == "sets":
+            rows = self.index.set_rows(parts[1])
+            if not rows:
+                raise ApiError(404, "set not found")
+            offset, limit = page_params(query)
+            summary = self.set_summary(rows[0])
+            return dict(summary, total=len(rows), offset=offset, limit=limit,
+                        items=self.index.records(rows[offset:offset + limit]))
+        if len(parts) == 2 and parts[0] == "cards":
+            record = self.index.card(parts[1])
+            if record is None:
+                raise ApiError(404, "card not found")
+            return record
+        if parts == ["search"]:
+            name = query.get("q", [""])[0]
+            if not name.strip():
+                raise ApiError(400, "q is required")
+            offset, limit = page_params(query)
+            rows = self.index.player_rows(name)
+            category = query.get("category", [None])[0]
+            year = query.get("year", [None])[0]
+            if category or year:
+                rows = [row for row in rows
+                        if (not category or self.columns["category"][row] == category)
+                        and (not year or self.columns["year"][row] == year)]
+            return {"total": len(rows), "offset": offset, "limit": limit,
+                    "items": self.index.records(rows[offset:offset + limit])}
+        raise ApiError(404, "not found")
+
+    def response(self, target):
+        """Return (status, body bytes, etag) for a target, from the LRU cache when possible."""
+        cached = self.cache.get(target)
+        if cached is not None:
+            self.cache.move_to_end(target)
+            return cached
+        try:
+            status, body = 200, self.route(target)
+        except ApiError as e:
+            status, body = e.status, {"error": str(e)}
+        data = json_codec.dumps_bytes(body, separators=(",", ":"), ensure_ascii=False)
+        etag = '"' + hashlib.blake2b(data, digest_size=12).hexdigest() + '"'
+        cached = (status, data, etag)
+        if status in (200, 404):
+            self.cache[target] = cached
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return cached
+
+def http_response(status, body=b"", etag=None, keep_alive=True, head=False):
+    headers = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+               "Content-Type: application/json; charset=utf-8",
+               "Cache-Control: no-cache",
+               "Connection: " + ("keep-alive" if keep_alive else "close")]
+    if status != 304:
+        headers.append(f"Content-Length: {len(body)}")
+    if etag:
+        headers.append(f"ETag: {etag}")
+    message = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1")
+    return message if status == 304 or head else message + body
+
+async def handle_connection(api, reader, writer):
+    """Serve HTTP/1.1 requests on one connection until the client closes it or asks to."""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                writer.write(http_response(431, b'{"error":"request head too large"}', keep_alive=False))
+                break
+            except asyncio.IncompleteReadError:
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ")
+            except ValueError:
+                writer.write(http_response(400, b'{"error":"bad request line"}', keep_alive=False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            if method not in ("GET", "HEAD"):
+                writer.write(http_response(405, b'{"error":"method not allowed"}', keep_alive=keep_alive))
+            else:
+                status, body, etag = api.response(target)
+                if status == 200 and headers.get("if-none-match") == etag:
+                    status = 304
+                writer.write(http_response(status, body, etag, keep_alive, head=method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(api, host, port):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(api, reader, writer), host, port,
+        limit=MAX_REQUEST_HEAD, backlog=1024)
+    print(f"Serving {len(api.index)} records on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the card dataset as a read-only JSON HTTP API.")
+    parser.add_argument("--dataset", type=Path, default=DEFAULT_DATASET,
+                        help="Single-file Parquet dataset written by build-parquet.py (default: output/dataset.parquet)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="Number of responses kept in the in-process LRU cache (default: 10000)")
+    args = parser.parse_args()
+
+    if not args.dataset.is_file():
+        print(f"Dataset {args.dataset} not found; run build-parquet.py first.")
+        raise SystemExit(1)
+    api = CardApi(CardIndex.from_parquet(args.dataset), args.cache_size)
+    try:
+        asyncio.run(serve(api, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
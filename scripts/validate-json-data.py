@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
-import json
 import sys
 import argparse
 import pathlib
 import glob
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import json_codec
+
+# Per-file validation facts are cached by content hash so unchanged files are not re-parsed.
+# Bump CACHE_VERSION whenever analyze_file changes the facts it extracts.
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = pathlib.Path(__file__).parent.parent / ".cache" / "validate-json-data.json"
 
 def traverse_card_obj(obj, collected, warnings):
     """
@@ -30,64 +38,37 @@ def traverse_card_obj(obj, collected, warnings):
             else:
                 warnings.append(f"Warning: 'variations' is not a list in object: {obj}")
 
-def collect_global_attributes(files):
+def analyze_file(file_path):
     """
-    Collect global attribute definitions from the root-level "attributes" arrays
-    of all files.
-    
-    Returns two dictionaries:
-      - global_attr_defs: mapping attribute -> dict of note -> count.
-      - canonical_global_attr_defs: mapping attribute -> canonical JSON definition,
-        if the attribute is defined consistently (only one note).
-    """
-    global_attr_defs = {}
-    for file in files:
-        try:
-            with open(file, "r") as f:
-                data = json.load(f)
-        except Exception:
-            continue  # Skip files that cannot be read
-        if "attributes" in data and isinstance(data["attributes"], list):
-            for attr_pair in data["attributes"]:
-                if isinstance(attr_pair, dict) and "attribute" in attr_pair and "note" in attr_pair:
-                    attr = attr_pair["attribute"]
-                    note = attr_pair["note"]
-                    if attr not in global_attr_defs:
-                        global_attr_defs[attr] = {}
-                    global_attr_defs[attr][note] = global_attr_defs[attr].get(note, 0) + 1
-    canonical_global_attr_defs = {}
-    for attr, notes_counts in global_attr_defs.items():
-        if len(notes_counts) == 1:
-            note = list(notes_counts.keys())[0]
-            canonical_global_attr_defs[attr] = {"attribute": attr, "note": note}
-    return global_attr_defs, canonical_global_attr_defs
-
-def validate_file(file_path, global_attr_defs, canonical_global_attr_defs):
-    """
-    Validate a single JSON file with two checks:
-      (a) Internal consistency:
-          - Each attribute used on cards (or nested variations), either defined at the card level
-            or at the set level, is defined in the root-level "attributes" array.
-          - Every attribute defined in the root appears on at least one card (or set).
-      (b) Also, extract the file's root attribute definitions (mapping attribute -> note)
-          for later cross-file consistency validation.
-    
-    For any attribute used on a card (or inherited from a set) but missing in the file's root attributes,
-    an error is recorded and a suggestion JSON record is collected.
-    
-    Returns a tuple: (list_of_errors, root_attribute_map, missing_suggestions)
+    Parse a single JSON file once and extract everything the validation needs from it:
+      - "attr_pairs": every (attribute, note) pair in the root-level "attributes" array,
+        used to build the global attribute definitions.
+      - "root_attr_map": mapping attribute -> note from this file.
+      - "card_attrs": sorted attributes used on cards (or nested variations) and sets.
+      - "errors": internal consistency errors that do not depend on other files.
+      - "unused_attrs": attributes defined in the root but not found on any card (or set).
+      - "warnings": warnings to report for this file.
+    This runs inside the worker processes of the parallel validation, so it must stay a
+    module-level function and return plain, picklable data.
     """
-    errors = []
-    warnings = []
-    missing_suggestions = []  # List of JSON objects for missing attributes
-    root_attr_map = {}  # mapping: attribute -> note from this file
+    facts = {
+        "path": str(file_path),
+        "attr_pairs": [],
+        "root_attr_map": {},
+        "card_attrs": [],
+        "errors": [],
+        "unused_attrs": [],
+        "warnings": [],
+    }
+    errors = facts["errors"]
+    warnings = facts["warnings"]
+    root_attr_map = facts["root_attr_map"]
 
     try:
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        data = json_codec.load_path(file_path)
     except Exception as e:
         errors.append(f"Failed to read JSON file: {e}")
-        return errors, root_attr_map, missing_suggestions
+        return facts
 
     # Extract root-level attributes from this file.
     if "attributes" in data:
@@ -95,6 +76,7 @@ def validate_file(file_path, global_attr_defs, canonical_global_attr_defs):
             if isinstance(attr_pair, dict) and "attribute" in attr_pair and "note" in attr_pair:
                 attr_name = attr_pair["attribute"]
                 note = attr_pair["note"]
+                facts["attr_pairs"].append((attr_name, note))
                 if attr_name in root_attr_map and root_attr_map[attr_name] != note:
                     errors.append(
                         f"In file, attribute '{attr_name}' defined with conflicting notes: '{root_attr_map[attr_name]}' and '{note}'."
@@ -108,7 +90,7 @@ def validate_file(file_path, global_attr_defs, canonical_global_attr_defs):
     card_attrs = set()
     if "sets" not in data:
         errors.append("Missing 'sets' property in JSON data.")
-        return errors, root_attr_map, missing_suggestions
+        return facts
 
     for s in data["sets"]:
         # Include set-level attributes if present.
@@ -129,9 +111,160 @@ def validate_file(file_path, global_attr_defs, canonical_global_attr_defs):
         for card in s["cards"]:
             traverse_card_obj(card, card_attrs, warnings)
 
-    # Two-way per-file validation:
-    # 1. Every attribute on a card (or inherited via the set) must be defined in the root-level attributes.
-    for attr in card_attrs:
+    facts["card_attrs"] = sorted(card_attrs)
+    # Every attribute defined in the root must appear on at least one card (or set).
+    facts["unused_attrs"] = [attr for attr in root_attr_map if attr not in card_attrs]
+    return facts
+
+def analyze_files(files, workers):
+    """
+    Analyze every file with analyze_file, using a process pool when workers > 1.
+    Results are returned in the same order as files.
+    """
+    if workers <= 1 or len(files) <= 1:
+        return [analyze_file(file) for file in files]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_file, files, chunksize=4))
+
+def file_hash(file_path):
+    """Return the SHA-256 hex digest of a file's raw bytes, or None if it cannot be read."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def load_cache(cache_path):
+    """
+    Load cached validation facts, a mapping of file path -> {"hash": ..., "facts": ...}.
+    Returns an empty mapping if the cache is missing, unreadable or from another CACHE_VERSION.
+    """
+    try:
+        cache = json_codec.load_path(cache_path)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+def save_cache(cache_path, entries):
+    """Write the validation cache atomically (temp file plus rename)."""
+    cache_path = pathlib.Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json_codec.dump({"version": CACHE_VERSION, "files": entries}, f, separators=(",", ":"))
+    os.replace(tmp_path, cache_path)
+
+def pattern_root(path_pattern):
+    """
+    Return the directory a path pattern searches (the part of a glob before its first
+    wildcard, or the directory itself), or None when the pattern names a single file.
+    """
+    p = pathlib.Path(path_pattern)
+    if p.is_dir():
+        return p
+    if p.is_file():
+        return None
+    parts = []
+    for part in p.parts:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return pathlib.Path(*parts) if parts else pathlib.Path(".")
+
+def prune_cache(entries, root, files):
+    """
+    Remove cache entries for files under root that were not found in this run (deleted or
+    renamed releases). Entries outside root are kept, so one cache can serve several categories.
+    Returns True if any entry was removed.
+    """
+    if root is None:
+        return False
+    root = os.path.normpath(root)
+    current = {os.path.normpath(str(file)) for file in files}
+    removed = [
+        path for path in entries
+        if os.path.normpath(path) not in current
+        and (root == "." and not os.path.isabs(path) or os.path.normpath(path).startswith(root + os.sep))
+    ]
+    for path in removed:
+        del entries[path]
+    return bool(removed)
+
+def analyze_files_cached(files, workers, cache_path, root=None):
+    """
+    Return analyze_file facts for every file (in order), re-parsing only the files whose
+    content hash is not in the cache at cache_path. The cache is updated with the new facts,
+    and entries for files under root that no longer exist are dropped.
+    """
+    entries = load_cache(cache_path)
+    pruned = prune_cache(entries, root, files)
+    hashes = [file_hash(file) for file in files]
+    file_facts = [None] * len(files)
+    stale = []
+    for i, (file, content_hash) in enumerate(zip(files, hashes)):
+        entry = entries.get(str(file))
+        if content_hash is not None and entry and entry["hash"] == content_hash:
+            facts = dict(entry["facts"], path=str(file))
+            facts["attr_pairs"] = [tuple(pair) for pair in facts["attr_pairs"]]
+            file_facts[i] = facts
+        else:
+            stale.append(i)
+
+    for i, facts in zip(stale, analyze_files([files[i] for i in stale], workers)):
+        file_facts[i] = facts
+        if hashes[i] is not None:
+            entries[str(files[i])] = {"hash": hashes[i], "facts": {k: v for k, v in facts.items() if k != "path"}}
+
+    if stale or pruned:
+        save_cache(cache_path, entries)
+    return file_facts
+
+def collect_global_attributes(file_facts):
+    """
+    Reduce global attribute definitions from the root-level "attributes" pairs
+    extracted from all files by analyze_file.
+    
+    Returns two dictionaries:
+      - global_attr_defs: mapping attribute -> dict of note -> count.
+      - canonical_global_attr_defs: mapping attribute -> canonical JSON definition,
+        if the attribute is defined consistently (only one note).
+    """
+    global_attr_defs = {}
+    for facts in file_facts:
+        for attr, note in facts["attr_pairs"]:
+            if attr not in global_attr_defs:
+                global_attr_defs[attr] = {}
+            global_attr_defs[attr][note] = global_attr_defs[attr].get(note, 0) + 1
+    canonical_global_attr_defs = {}
+    for attr, notes_counts in global_attr_defs.items():
+        if len(notes_counts) == 1:
+            note = list(notes_counts.keys())[0]
+            canonical_global_attr_defs[attr] = {"attribute": attr, "note": note}
+    return global_attr_defs, canonical_global_attr_defs
+
+def validate_file(facts, global_attr_defs, canonical_global_attr_defs):
+    """
+    Validate a single JSON file from the facts extracted by analyze_file, with two checks:
+      (a) Internal consistency:
+          - Each attribute used on cards (or nested variations), either defined at the card level
+            or at the set level, is defined in the root-level "attributes" array.
+          - Every attribute defined in the root appears on at least one card (or set).
+      (b) Also, return the file's root attribute definitions (mapping attribute -> note)
+          for later cross-file consistency validation.
+    
+    For any attribute used on a card (or inherited from a set) but missing in the file's root attributes,
+    an error is recorded and a suggestion JSON record is collected.
+    
+    Returns a tuple: (list_of_errors, root_attribute_map, missing_suggestions)
+    """
+    errors = list(facts["errors"])
+    missing_suggestions = []  # List of JSON objects for missing attributes
+    root_attr_map = facts["root_attr_map"]
+
+    # Every attribute on a card (or inherited via the set) must be defined in the root-level attributes.
+    for attr in facts["card_attrs"]:
         if attr not in root_attr_map:
             suggestion = None
             if attr in global_attr_defs:
@@ -149,15 +282,13 @@ def validate_file(file_path, global_attr_defs, canonical_global_attr_defs):
                 f"Attribute '{attr}' found on a card (or via set) but not defined in root attributes. (A suggested definition is provided below.)"
             )
             missing_suggestions.append(suggestion)
-    # 2. Every attribute defined in the root must appear on at least one card (or set).
-    for attr in root_attr_map:
-        if attr not in card_attrs:
-            errors.append(
-                f"Attribute '{attr}' defined in root attributes but not found on any card (or set)."
-            )
+    for attr in facts["unused_attrs"]:
+        errors.append(
+            f"Attribute '{attr}' defined in root attributes but not found on any card (or set)."
+        )
 
     # Report any warnings.
-    for warn in warnings:
+    for warn in facts["warnings"]:
         print(warn, file=sys.stderr)
 
     return errors, root_attr_map, missing_suggestions
@@ -185,7 +316,13 @@ def main():
                     "provided as a single JSON array block at the end of the report."
     )
     parser.add_argument("path", help="Path, directory, or glob pattern for JSON files to validate")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of processes used to parse files (0 = one per CPU, default: 0)")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH),
+                        help="File caching per-file validation results by content hash (default: .cache/validate-json-data.json)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every file and leave the cache untouched")
     args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
 
     files = find_json_files(args.path)
     if not files:
@@ -193,19 +330,24 @@ def main():
         print(f"No JSON files found for pattern: {args.path} (full path searched: {full_path})", file=sys.stderr)
         sys.exit(1)
 
-    # First pass: collect global attribute definitions.
-    global_attr_defs, canonical_global_attr_defs = collect_global_attributes(files)
+    # Parse every changed file exactly once, then reduce the global attribute definitions
+    # from the fresh and cached per-file facts.
+    if args.no_cache:
+        file_facts = analyze_files(files, workers)
+    else:
+        file_facts = analyze_files_cached(files, workers, args.cache, pattern_root(args.path))
+    global_attr_defs, canonical_global_attr_defs = collect_global_attributes(file_facts)
 
     overall_errors = {}
     file_missing_suggestions = {}  # mapping filename -> list of suggestion JSON objects
 
     # Validate each file individually.
-    for file in files:
-        file_errors, file_attr_map, missing_suggestions = validate_file(file, global_attr_defs, canonical_global_attr_defs)
+    for facts in file_facts:
+        file_errors, file_attr_map, missing_suggestions = validate_file(facts, global_attr_defs, canonical_global_attr_defs)
         if file_errors:
-            overall_errors[str(file)] = file_errors
+            overall_errors[facts["path"]] = file_errors
         if missing_suggestions:
-            file_missing_suggestions[str(file)] = missing_suggestions
+            file_missing_suggestions[facts["path"]] = missing_suggestions
 
     # Cross-file validation: check for inconsistent attribute definitions.
     cross_file_errors = []
@@ -225,7 +367,7 @@ def main():
             # If there are missing attribute suggestions, output them as one JSON block.
             if file in file_missing_suggestions:
                 print("\nSuggested JSON definitions for missing attributes for this file:", file=sys.stderr)
-                print(json.dumps(file_missing_suggestions[file], indent=2), file=sys.stderr)
+                print(json_codec.dumps(file_missing_suggestions[file], indent=2), file=sys.stderr)
     # Report cross-file consistency errors.
     if cross_file_errors:
         print("\nCross-file consistency errors:", file=sys.stderr)
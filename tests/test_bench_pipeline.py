@@ -0,0 +1,100 @@
+import importlib.util
+import json
+import subprocess
+import sys
+
+import jsonschema
+
+from test_build_parquet import REPO_DIR, RELEASES, copy_releases
+
+SCRIPT = REPO_DIR / "scripts" / "bench-pipeline.py"
+sys.path.insert(0, str(REPO_DIR / "scripts"))
+spec = importlib.util.spec_from_file_location("parse_panini", REPO_DIR / "scripts" / "parse-panini-checklist-csv.py")
+parse_panini = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(parse_panini)
+
+
+def run(categories_dir, output_dir, *args):
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), "--categories-dir", str(categories_dir), "--output-dir", str(output_dir),
+         "--workers", "2", *args],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+
+def unique_ids(node):
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "uniqueId":
+                yield value
+            else:
+                yield from unique_ids(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from unique_ids(value)
+
+
+def test_generated_corpus_is_schema_valid_and_keeps_the_release_shapes(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    (categories_dir / "baseball.json").write_text(json.dumps({"category": {
+        "name": "baseball", "uniqueId": "00000000-0000-4000-8000-000000000001", "years": [{"year": "1978", "releases": [
+            {"name": "Topps", "indexed": True, "uniqueId": json.loads((categories_dir / RELEASES[0]).read_text())["uniqueId"]},
+        ]}]}}, indent=4), encoding="utf-8")
+    output = run(categories_dir, tmp_path / "bench", "generate", "--scale", "3")
+    assert "3x corpus: 6 releases" in output
+    corpus_dir = tmp_path / "bench" / "3x"
+
+    schema = json.loads((REPO_DIR / "schemas" / "release.json").read_text(encoding="utf-8"))
+    seen = set()
+    for release in RELEASES:
+        source = json.loads((categories_dir / release).read_text(encoding="utf-8"))
+        for copy, suffix in enumerate(["", "-Synthetic-1", "-Synthetic-2"]):
+            path = corpus_dir / "categories" / release.replace(".json", f"{suffix}.json")
+            data = json.loads(path.read_text(encoding="utf-8"))
+            jsonschema.validate(data, schema)
+            assert data["name"] == (source["name"] if copy == 0 else f"{source['name']} Synthetic {copy}")
+            assert [len(s["cards"]) for s in data["sets"]] == [len(s["cards"]) for s in source["sets"]]
+            assert [s.get("parallels") for s in data["sets"]] == [s.get("parallels") for s in source["sets"]]
+            ids = list(unique_ids(data))
+            assert len(ids) == len(list(unique_ids(source)))
+            assert seen.isdisjoint(ids)
+            seen.update(ids)
+
+            checklist = corpus_dir / "checklists" / path.parent.parent.name / path.with_suffix(".csv").name
+            built = parse_panini.process_csv_with_pandas(checklist)
+            base_sets = {s["name"]: s for s in built["sets"]}
+            for card_set in source["sets"]:
+                assert len(base_sets[card_set["name"]]["cards"]) == len(card_set["cards"])
+
+    category = json.loads((corpus_dir / "categories" / "baseball.json").read_text(encoding="utf-8"))
+    entries = category["category"]["years"][0]["releases"]
+    assert [entry["name"] for entry in entries] == ["Topps", "Topps Synthetic 1", "Topps Synthetic 2"]
+    assert entries[1]["uniqueId"] == json.loads(
+        (corpus_dir / "categories" / "baseball" / "1978" / "1978-Topps-Synthetic-1.json").read_text())["uniqueId"]
+
+    # The corpus is reused while the source tree is unchanged.
+    assert "Generating" not in run(categories_dir, tmp_path / "bench", "generate", "--scale", "3")
+
+
+def test_run_compares_with_the_saved_baseline(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    baseline = tmp_path / "baseline.json"
+    args = ["run", "--scale", "1", "--cases", "validate", "--repeat", "1", "--baseline", str(baseline)]
+
+    assert "No baseline" in run(categories_dir, tmp_path / "bench", *args)
+    run(categories_dir, tmp_path / "bench", *args, "--save-baseline")
+    stored = json.loads(baseline.read_text(encoding="utf-8"))
+    assert set(stored["results"]["1x"]["cases"]) == {"validate"}
+
+    output = run(categories_dir, tmp_path / "bench", *args, "--tolerance", "100", "--memory-tolerance", "100")
+    assert "1x validate   vs baseline" in output
+    assert "No regressions" in output
+
+    stored["results"]["1x"]["cases"]["validate"]["seconds"] = 1e-9
+    baseline.write_text(json.dumps(stored), encoding="utf-8")
+    result = subprocess.run([sys.executable, str(SCRIPT), "--categories-dir", str(categories_dir),
+                             "--output-dir", str(tmp_path / "bench"), *args], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "REGRESSION" in result.stdout
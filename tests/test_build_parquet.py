@@ -0,0 +1,110 @@
+import json
+import shutil
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+REPO_DIR = Path(__file__).parent.parent
+BUILD_SCRIPT = REPO_DIR / "scripts" / "build-parquet.py"
+RELEASES = ["baseball/1978/1978-Topps.json", "hockey/1979-80/1979-80-Topps.json"]
+
+
+def copy_releases(tmp_path):
+    categories_dir = tmp_path / "categories"
+    for release in RELEASES:
+        target = categories_dir / release
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(REPO_DIR / "categories" / release, target)
+    return categories_dir
+
+
+def run_build(categories_dir, output_dir, *args):
+    return subprocess.run(
+        [sys.executable, str(BUILD_SCRIPT), "--categories-dir", str(categories_dir),
+         "--output-dir", str(output_dir), *args],
+        capture_output=True, text=True,
+    )
+
+
+def test_second_incremental_build_reuses_every_fragment(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    output_dir = tmp_path / "output"
+
+    first = run_build(categories_dir, output_dir, "--incremental")
+    assert first.returncode == 0, first.stdout + first.stderr
+    assert "Incremental build: 2 of 2 releases re-flattened" in first.stdout
+    assert (output_dir / ".cache" / "manifest.json").is_file()
+    first_dataset = (output_dir / "dataset.parquet").read_bytes()
+
+    second = run_build(categories_dir, output_dir, "--incremental")
+    assert second.returncode == 0, second.stdout + second.stderr
+    assert "Incremental build: 0 of 2 releases re-flattened" in second.stdout
+    assert (output_dir / "dataset.parquet").read_bytes() == first_dataset
+
+
+def test_incremental_build_ignores_fragment_from_aborted_build(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    output_dir = tmp_path / "output"
+    assert run_build(categories_dir, output_dir, "--incremental").returncode == 0
+    first_dataset = (output_dir / "dataset.parquet").read_bytes()
+
+    # Give two cards the same uniqueId: the fragment is rebuilt, then the build aborts.
+    release = categories_dir / RELEASES[0]
+    original = release.read_text(encoding="utf-8")
+    data = json.loads(original)
+    data["sets"][0]["cards"][1]["uniqueId"] = data["sets"][0]["cards"][0]["uniqueId"]
+    release.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    aborted = run_build(categories_dir, output_dir, "--incremental")
+    assert aborted.returncode == 1
+    assert "Duplicate card_unique_id" in aborted.stdout
+
+    # Reverting the JSON must not pick up the fragment written by the aborted build.
+    release.write_text(original, encoding="utf-8")
+    reverted = run_build(categories_dir, output_dir, "--incremental")
+    assert reverted.returncode == 0, reverted.stdout + reverted.stderr
+    assert (output_dir / "dataset.parquet").read_bytes() == first_dataset
+
+
+def test_sqlite_export_holds_every_record_with_valid_references(tmp_path):
+    output_dir = tmp_path / "output"
+    result = run_build(copy_releases(tmp_path), output_dir, "--sqlite")
+    assert result.returncode == 0, result.stdout + result.stderr
+    records = pq.read_table(output_dir / "dataset.parquet").num_rows
+
+    connection = sqlite3.connect(output_dir / "dataset.sqlite")
+    count = lambda table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    assert count("releases") == len(RELEASES)
+    assert count("cards") + count("variations") + count("parallels") == records
+    assert connection.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert not (output_dir / "dataset.sqlite.tmp").exists()
+
+
+def test_stats_count_the_dataset_and_follow_release_changes(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    output_dir = tmp_path / "output"
+    assert run_build(categories_dir, output_dir, "--incremental").returncode == 0
+    stats = json.loads((output_dir / "stats.json").read_text(encoding="utf-8"))
+    records = pq.read_table(output_dir / "dataset.parquet").to_pylist()
+    for category, category_stats in stats["categories"].items():
+        rows = [record for record in records if record["category"] == category]
+        assert category_stats["cards"] == sum(1 for record in rows if not record["card_parent_unique_id"])
+        assert category_stats["parallels"] == sum(1 for record in rows if record["parallel"])
+        total = category_stats["cards"] + category_stats["variations"] + category_stats["parallels"]
+        assert total == len(rows) == sum(
+            sum(release.values()) for year in category_stats["years"].values() for release in year["releases"].values())
+
+    unchanged = run_build(categories_dir, output_dir, "--incremental")
+    assert "Statistics in" in unchanged.stdout and "are unchanged" in unchanged.stdout
+
+    release = categories_dir / RELEASES[0]
+    data = json.loads(release.read_text(encoding="utf-8"))
+    del data["sets"][0]["cards"][0]
+    release.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    changed = run_build(categories_dir, output_dir, "--incremental")
+    assert "Statistics written to" in changed.stdout
+    category = RELEASES[0].split("/")[0]
+    new_stats = json.loads((output_dir / "stats.json").read_text(encoding="utf-8"))
+    assert new_stats["categories"][category]["cards"] == stats["categories"][category]["cards"] - 1
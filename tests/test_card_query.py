@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from test_build_parquet import copy_releases, run_build
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from card_query import CardIndex  # noqa: E402
+
+
+def test_lookups_match_a_scan_of_the_dataset(tmp_path):
+    output_dir = tmp_path / "output"
+    result = run_build(copy_releases(tmp_path), output_dir)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    dataset = output_dir / "dataset.parquet"
+    records = pq.read_table(dataset).to_pylist()
+    index = CardIndex.from_parquet(dataset)
+    assert len(index) == len(records)
+
+    for record in records[::25]:
+        assert index.card(record["card_unique_id"]) == record
+        assert index.set(record["set_unique_id"]) == [
+            r for r in records if r["set_unique_id"] == record["set_unique_id"]]
+        assert index.cards_by_number(record["release_unique_id"], record["card_number"]) == [
+            r for r in records if (r["release_unique_id"], r["card_number"]) ==
+            (record["release_unique_id"], record["card_number"])]
+
+    surname = records[0]["card_name"].split()[-1]
+    matches = index.search_player(surname.upper())
+    assert matches and all(surname in r["card_name"].split() for r in matches)
+    assert index.card("not-a-card") is None
+    assert index.search_player("zzzz") == []
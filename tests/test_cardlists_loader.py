@@ -0,0 +1,32 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from test_build_parquet import REPO_DIR, RELEASES
+
+sys.path.insert(0, str(REPO_DIR / "examples" / "python"))
+from cardlists import ValidationError, load_release, parse_release  # noqa: E402
+
+
+def test_releases_round_trip_through_the_typed_objects():
+    for name in RELEASES:
+        path = REPO_DIR / "categories" / name
+        release = load_release(path, validate=True)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data.pop("$schema", None)
+        assert release.to_dict() == data
+        assert sum(1 for _ in release.iter_cards()) == sum(len(s["cards"]) for s in data["sets"])
+
+
+def test_validation_reports_every_problem():
+    data = {"name": "x", "version": 1, "sets": [{"uniqueId": "a", "name": "s", "cards": [{"name": "n", "numberedTo": True}]}]}
+    with pytest.raises(ValidationError) as error:
+        parse_release(data, validate=True)
+    assert error.value.errors == [
+        "release.version: expected a string",
+        "release.uniqueId: field required",
+        "release.sets[0].cards[0].uniqueId: field required",
+        "release.sets[0].cards[0].numberedTo: expected an integer",
+    ]
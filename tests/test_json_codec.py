@@ -0,0 +1,20 @@
+import json
+import sys
+from pathlib import Path
+
+from test_build_parquet import REPO_DIR, RELEASES
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import json_codec  # noqa: E402
+
+
+def test_codec_writes_exactly_what_json_writes():
+    documents = [json.loads((REPO_DIR / "categories" / name).read_text(encoding="utf-8")) for name in RELEASES]
+    documents.append({"name": "Café", "numberedTo": 99, "percent": 33.333333333333336, "empty": [], "none": None})
+    formats = [{"indent": 4}, {"indent": 2}, {"indent": 2, "sort_keys": True}, {"indent": "  ", "ensure_ascii": False},
+               {"separators": (",", ":")}, {"separators": (",", ":"), "ensure_ascii": False}, {}]
+    for document in documents:
+        for options in formats:
+            assert json_codec.dumps(document, **options) == json.dumps(document, **options)
+        text = json.dumps(document, ensure_ascii=False)
+        assert json_codec.loads(text) == json_codec.loads(text.encode("utf-8")) == document
@@ -0,0 +1,30 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from json_rewrite import load_json, map_files, write_json  # noqa: E402
+
+
+def test_write_json_keeps_the_file_style_and_skips_unchanged_files(tmp_path):
+    path = tmp_path / "release.json"
+    path.write_text(json.dumps({"name": "Café", "sets": [{"cards": []}]}, indent=2, ensure_ascii=False) + "\n",
+                    encoding="utf-8")
+    os.chmod(path, 0o640)
+    data, original = load_json(path)
+    written = path.stat().st_mtime_ns
+
+    assert not write_json(path, data, original)
+    assert path.stat().st_mtime_ns == written
+
+    data["uniqueId"] = "1f1b2a3c-0000-4000-8000-000000000001"
+    assert write_json(path, data, original)
+    text = path.read_text(encoding="utf-8")
+    assert text == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert [entry.name for entry in tmp_path.iterdir()] == ["release.json"]
+
+
+def test_map_files_keeps_the_item_order(tmp_path):
+    assert list(map_files(str, range(20), 2)) == [str(i) for i in range(20)]
@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+from test_build_parquet import copy_releases, run_build
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from name_search import NameSearchIndex  # noqa: E402
+
+
+def test_name_index_finds_misspelled_names_with_filters(tmp_path):
+    output_dir = tmp_path / "output"
+    result = run_build(copy_releases(tmp_path), output_dir, "--name-index")
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    index = NameSearchIndex(output_dir / "name-index")
+    matches = index.search("Grifey")
+    assert matches[0]["name"] == "Ken Griffey"
+    assert matches[0]["cards"][0]["category"] == "baseball"
+    assert index.search("Grifey", category="hockey") == []
+    assert index.search("GRETZKY", category="hockey", year="1979-80")[0]["name"] == "Wayne Gretzky"
+    assert all("RC" in card["attributes"]
+               for match in index.search("Gretzky", attributes=["RC"]) for card in match["cards"])
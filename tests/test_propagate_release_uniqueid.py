@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+from test_build_parquet import REPO_DIR, copy_releases
+
+SCRIPT = REPO_DIR / "scripts" / "propagate-release-uniqueId.py"
+
+
+def test_propagation_reports_orphans_and_only_rewrites_changed_releases(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    baseball = categories_dir / "baseball" / "1978" / "1978-Topps.json"
+    release = json.loads(baseball.read_text(encoding="utf-8"))
+    orphan = categories_dir / "baseball" / "1978" / "1978-Orphan.json"
+    orphan.write_text("{}", encoding="utf-8")
+    category_file = categories_dir / "baseball.json"
+    category_file.write_text(json.dumps({"category": {"name": "baseball", "years": [{"year": "1978", "releases": [
+        {"name": "Topps", "indexed": True, "uniqueId": "1f1b2a3c-0000-4000-8000-000000000001"},
+        {"name": "Missing", "indexed": True, "uniqueId": "1f1b2a3c-0000-4000-8000-000000000002"},
+        {"name": "Kellogg's", "indexed": False},
+    ]}]}}), encoding="utf-8")
+
+    def run():
+        result = subprocess.run([sys.executable, str(SCRIPT), str(category_file), "--workers", "2"],
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        return result.stdout
+
+    first = run()
+    assert "Missing file for indexed release 'Missing' (1978)" in first
+    assert f"for file '{orphan}'" in first
+    assert "1 release files updated, 0 unchanged, 0 errors" in first
+    updated = json.loads(baseball.read_text(encoding="utf-8"))
+    assert updated["uniqueId"] == "1f1b2a3c-0000-4000-8000-000000000001"
+    assert updated["sets"] == release["sets"]
+
+    written = baseball.stat().st_mtime_ns
+    assert "0 release files updated, 1 unchanged, 0 errors" in run()
+    assert baseball.stat().st_mtime_ns == written
@@ -0,0 +1,36 @@
+import json
+import sys
+from pathlib import Path
+
+from test_build_parquet import copy_releases
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from release_sidecar import ReleaseSidecar, sidecar_path_for, sync_sidecars  # noqa: E402
+
+
+def test_sidecar_lookups_match_the_release_and_follow_its_hash(tmp_path):
+    categories_dir = copy_releases(tmp_path)
+    sidecar_dir = tmp_path / "sidecars"
+    assert sync_sidecars(categories_dir, sidecar_dir) == (2, 0, 0)
+    assert sync_sidecars(categories_dir, sidecar_dir) == (0, 2, 0)
+
+    json_path = next(categories_dir.glob("baseball/*/*.json"))
+    data = json.loads(json_path.read_text(encoding="utf-8"))
+    with ReleaseSidecar.open(json_path, categories_dir, sidecar_dir) as sidecar:
+        assert sidecar.release() == {key: value for key, value in data.items() if key != "sets"}
+        for card_set in data["sets"]:
+            assert sidecar.get_set(card_set["uniqueId"], with_cards=True) == card_set
+            for card in card_set["cards"]:
+                assert sidecar.get_card(card["uniqueId"]) == card
+        assert sidecar.get_card(data["sets"][0]["uniqueId"]) is None
+        assert sidecar.get_card("not-a-uuid") is None
+
+    # Editing the release invalidates its sidecar; deleting it removes the sidecar.
+    data["sets"][0]["cards"][0]["name"] = "Renamed Player"
+    json_path.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    with ReleaseSidecar.open(json_path, categories_dir, sidecar_dir) as sidecar:
+        assert sidecar.get_card(data["sets"][0]["cards"][0]["uniqueId"])["name"] == "Renamed Player"
+    hockey = next(categories_dir.glob("hockey/*/*.json"))
+    hockey.unlink()
+    assert sync_sidecars(categories_dir, sidecar_dir) == (0, 1, 1)
+    assert not sidecar_path_for(hockey, categories_dir, sidecar_dir).exists()
@@ -0,0 +1,56 @@
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+from test_build_parquet import copy_releases, run_build
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+from card_query import CardIndex  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("serve_api", SCRIPTS_DIR / "serve-api.py")
+serve_api = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(serve_api)
+
+
+async def get(port, target, etag=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    extra = f"If-None-Match: {etag}\r\n" if etag else ""
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n{extra}\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split(" ")[1]), headers, json.loads(body) if body else None
+
+
+def test_api_serves_lookups_with_etags_and_pagination(tmp_path):
+    output_dir = tmp_path / "output"
+    result = run_build(copy_releases(tmp_path), output_dir)
+    assert result.returncode == 0, result.stdout + result.stderr
+    api = serve_api.CardApi(CardIndex.from_parquet(output_dir / "dataset.parquet"), cache_size=10)
+
+    async def scenario():
+        server = await asyncio.start_server(
+            lambda reader, writer: serve_api.handle_connection(api, reader, writer), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            status, _, releases = await get(port, "/releases")
+            assert status == 200 and releases["total"] == 2
+            release_id = releases["items"][0]["release_unique_id"]
+            _, _, release = await get(port, f"/releases/{release_id}")
+            set_id = release["sets"][0]["set_unique_id"]
+
+            status, headers, page = await get(port, f"/sets/{set_id}?offset=2&limit=3")
+            assert status == 200 and len(page["items"]) == 3 and page["offset"] == 2
+            assert (await get(port, f"/sets/{set_id}?offset=2&limit=3", headers["ETag"]))[0] == 304
+
+            card = page["items"][0]
+            assert (await get(port, f"/cards/{card['card_unique_id']}"))[2] == card
+            assert (await get(port, "/cards/missing"))[0] == 404
+            assert (await get(port, f"/sets/{set_id}?limit=5000"))[0] == 400
+
+    asyncio.run(scenario())